@@ -0,0 +1,73 @@
+import re
+import threading
+from collections import deque
+
+ANSI_ESCAPE = re.compile(r'\x1B\[[0-9;]*[mK]')
+
+CHAIN_START = "Entering new CrewAgentExecutor chain"
+HIGHLIGHT_PHRASES = [
+    CHAIN_START,
+    "Theme Expert",
+    "Agenda Planner",
+    "Venue Finder",
+    "Travel & Logistics Expert",
+    "Budget Analyst",
+    "Finished chain.",
+]
+# One combined pattern instead of a substring check and replace per phrase
+HIGHLIGHT_PATTERN = re.compile('|'.join(re.escape(phrase) for phrase in HIGHLIGHT_PHRASES))
+
+class AgentLog:
+    """
+    Thread-safe ring buffer of agent log lines with ANSI codes stripped and agent names highlighted.
+    Only the most recent max_lines lines are kept, so memory and rendering cost stay flat on long runs.
+    """
+
+    def __init__(self, max_lines=200):
+        self.lines = deque(maxlen=max_lines)
+        self.partial = ''
+        self.colors = ['red', 'green', 'blue', 'orange']  # Define a list of colors
+        self.color_index = 0  # Initialize color index
+        self.lock = threading.Lock()
+
+    def _highlight(self, line, color_index):
+        """Highlight the agent names in a line; returns the line and the color index after it."""
+        def replace(match):
+            nonlocal color_index
+            phrase = match.group(0)
+            if phrase == CHAIN_START:
+                # Each new agent chain switches to the next color
+                color_index = (color_index + 1) % len(self.colors)
+            return f":{self.colors[color_index]}[{phrase}]"
+        return HIGHLIGHT_PATTERN.sub(replace, line), color_index
+
+    def _append(self, line):
+        line, self.color_index = self._highlight(line, self.color_index)
+        self.lines.append(line)
+
+    def write(self, data):
+        # Filter out ANSI escape codes
+        cleaned_data = ANSI_ESCAPE.sub('', data)
+        with self.lock:
+            *complete, self.partial = (self.partial + cleaned_data).split('\n')
+            for line in complete:
+                if line.strip():
+                    self._append(line)
+        return len(data)
+
+    def flush(self):
+        with self.lock:
+            if self.partial.strip():
+                self._append(self.partial)
+                self.partial = ''
+
+    def snapshot(self):
+        """
+        Return the buffered lines, including an unterminated last line, without changing
+        the log. Readers poll this, so every line written so far shows on the next poll.
+        """
+        with self.lock:
+            lines = list(self.lines)
+            if self.partial.strip():
+                lines.append(self._highlight(self.partial, self.color_index)[0])
+            return lines
@@ -1,80 +1,60 @@
-__import__('pysqlite3')
-import sys
-sys.modules['sqlite3'] = sys.modules.pop('pysqlite3')
-
-
 from dotenv import load_dotenv
 load_dotenv()
 
-from crewai import Crew
-from event_agents import EventAgents, StreamToExpander
-from event_tasks import EventTasks
+from config import Config
+from metrics import recorder
 import streamlit as st
 import datetime
 import sys
 import os
+import time
 
 st.set_page_config(layout="wide", initial_sidebar_state="expanded")
 
 
-def icon(emoji: str):
-    """Shows an emoji as a Notion-style page icon."""
-    st.write(
-        f'<span style="font-size: 78px; line-height: 1">{emoji}</span>',
-        unsafe_allow_html=True,
-    )
-
-
-class EventCrew:
-
-    def __init__(self, event_description, location, people_count, event_datetime, additional_details, today_str):
-        self.event_description = event_description
-        self.location = location
-        self.people_count = people_count
-        self.event_datetime = event_datetime
-        self.additional_details = additional_details
-        self.today_str = today_str
-        self.output_placeholder = st.empty()
+@st.cache_resource
+def get_job_runner():
+    """
+    One worker pool per server process, shared by every session.
+    Created on the first plan request so that plain page loads and form
+    interactions never import crewai or the tools.
+    """
+    # crewai's chromadb needs a newer SQLite than some hosts ship; swap it in before anything imports sqlite3
+    __import__('pysqlite3')
+    sys.modules['sqlite3'] = sys.modules.pop('pysqlite3')
 
-    def run(self):
-        agents = EventAgents()
-        tasks = EventTasks()
+    from jobs import JobRunner
+    return JobRunner()
 
-        theme_expert = agents.theme_expert()
-        agenda_planner = agents.agenda_planner()
-        venue_finder = agents.venue_finder()
-        travel_logistics_expert = agents.travel_logistics_expert()
-        budget_analyst = agents.budget_analyst()
 
-        theme_task = tasks.theme_task(theme_expert, self.event_description, self.additional_details, self.today_str)
-        agenda_task = tasks.agenda_task(agenda_planner, self.event_description, self.people_count, self.event_datetime, self.additional_details, self.today_str)
-        venue_task = tasks.venue_task(venue_finder, self.location, self.people_count, self.event_datetime, self.additional_details, self.today_str)
-        travel_task = tasks.travel_task(travel_logistics_expert, self.location, self.people_count, self.event_datetime, self.additional_details, self.today_str)
-        budget_task = tasks.budget_task(budget_analyst, self.location, self.people_count, self.event_datetime, self.additional_details, self.today_str)
+def show_partial_plan(job, file_name: str):
+    """Render finished sections in plan order, one placeholder each, with a download of what is ready."""
+    from event_crew import EventCrew
 
-        crew = Crew(
-            agents=[theme_expert, agenda_planner, venue_finder, travel_logistics_expert, budget_analyst],
-            tasks=[theme_task, agenda_task, venue_task, travel_task, budget_task],
-            verbose=True
+    col1, col2 = st.columns([6, 1])
+    with col1:
+        st.markdown("## 🎊 Your Event Plan (so far)")
+    with col2:
+        st.download_button(
+            label="Download partial plan",
+            data=job.partial_plan,
+            file_name=file_name.replace('.md', '_partial.md'),
+            mime="text/markdown"
         )
-
-        result = crew.kickoff()
-        # Combine all agent/task outputs if available
-        if hasattr(result, "tasks_output") and result.tasks_output:
-            combined = []
-            for i, task_output in enumerate(result.tasks_output):
-                # Try to get a readable header for each task
-                task_name = crew.tasks[i].description.splitlines()[0].replace(':', '').strip() if hasattr(crew.tasks[i], 'description') else f"Task {i+1}"
-                # Each task_output may have .raw or .output or similar
-                if hasattr(task_output, "raw"):
-                    combined.append(f"### {task_name}\n{task_output.raw}")
-                else:
-                    combined.append(f"### {task_name}\n{str(task_output)}")
-            final_output = "\n\n---\n\n".join(combined)
+    for name in EventCrew.TASK_NAMES:
+        placeholder = st.empty()
+        if name in job.sections:
+            placeholder.markdown(f"### {EventCrew.SECTION_TITLES[name]}\n{job.sections[name]}")
         else:
-            final_output = str(result)
-        self.output_placeholder.markdown(final_output)
-        return final_output
+            placeholder.info(f"⏳ {EventCrew.SECTION_TITLES[name]} is still being prepared...")
+
+
+def icon(emoji: str):
+    """Shows an emoji as a Notion-style page icon."""
+    st.write(
+        f'<span style="font-size: 78px; line-height: 1">{emoji}</span>',
+        unsafe_allow_html=True,
+    )
 
 
 if __name__ == "__main__":
@@ -182,27 +162,56 @@ if __name__ == "__main__":
             st.error("❌ Please select a valid date and time.")
             st.stop()
         
-        # Show event summary
         event_datetime = f"{date_input.strftime('%Y-%m-%d')} {time_input.strftime('%H:%M')}"
-        
+
+        # Plans run in the background; the job id in the URL lets a refresh pick the same job up again
+        job_id = get_job_runner().submit({
+            'event_description': event_description,
+            'location': location,
+            'people_count': int(people_count),
+            'event_datetime': event_datetime,
+            'additional_details': additional_details,
+            'today_str': today_str,
+        })
+        st.session_state["job_id"] = job_id
+        st.query_params["job"] = job_id
+
+    job_id = st.session_state.get("job_id") or st.query_params.get("job")
+    if job_id:
+        from event_crew import EventCrew
+        from jobs import SUCCEEDED
+
+        st.session_state["job_id"] = job_id
+        runner = get_job_runner()
+        job = runner.get(job_id)
+        if job is None:
+            st.warning("This event plan is no longer available. Please generate it again.")
+            st.stop()
+
+        inputs = job.inputs
+        event_dt = datetime.datetime.strptime(inputs['event_datetime'], '%Y-%m-%d %H:%M')
+
+        # Show event summary
         st.markdown("### 📝 Event Summary")
-        with st.expander("Click to view event details", expanded=True):
+        with st.expander("Click to view event details", expanded=not job.is_finished):
             col1, col2, col3 = st.columns(3)
             with col1:
-                st.write(f"**Event:** {event_description}")
-                st.write(f"**Location:** {location}")
+                st.write(f"**Event:** {inputs['event_description']}")
+                st.write(f"**Location:** {inputs['location']}")
             with col2:
-                st.write(f"**Attendees:** {people_count}")
-                st.write(f"**Date:** {date_input.strftime('%d %B %Y')}")
+                st.write(f"**Attendees:** {inputs['people_count']}")
+                st.write(f"**Date:** {event_dt.strftime('%d %B %Y')}")
             with col3:
-                st.write(f"**Time:** {time_input.strftime('%I:%M %p')}")
-                if additional_details.strip():
-                    st.write(f"**Special Notes:** {additional_details[:100]}...")
-        
-        # Run the AI agents with enhanced error handling
-        with st.status("🤖 **AI Agents are working on your event...**", state="running", expanded=True) as status:
-            with st.container(height=400, border=False):
-                try:
+                st.write(f"**Time:** {event_dt.strftime('%I:%M %p')}")
+                if inputs['additional_details'].strip():
+                    st.write(f"**Special Notes:** {inputs['additional_details'][:100]}...")
+
+        file_name = f"event_plan_{inputs['event_description'].replace(' ', '_').lower()}_{event_dt.strftime('%Y%m%d')}.md"
+
+        if not job.is_finished:
+            with st.status("🤖 **AI Agents are working on your event...**", state="running", expanded=True):
+                st.progress(job.progress, text=f"{len(job.completed)} of {len(EventCrew.TASK_NAMES)} sections ready")
+                with st.container(height=400, border=False):
                     # Display agent progress
                     st.write("🔍 **Theme Expert**: Researching creative themes...")
                     st.write("📅 **Agenda Planner**: Designing event schedule...")
@@ -210,27 +219,28 @@ if __name__ == "__main__":
                     st.write("🚗 **Travel Expert**: Planning logistics...")
                     st.write("💰 **Budget Analyst**: Calculating costs...")
                     st.write("---")
-                    
-                    sys.stdout = StreamToExpander(st)
-                    event_crew = EventCrew(event_description, location, people_count, event_datetime, additional_details, today_str)
-                    result = event_crew.run()
-                    
-                    if not result:
-                        st.error("No event plan was generated. Please try again.")
-                        st.stop()
-                        
-                except Exception as e:
-                    st.error(f"An error occurred while generating the event plan: {str(e)}")
-                    st.error("This might be due to:")
-                    st.error("- API rate limits or connectivity issues")
-                    st.error("- Invalid API keys")
-                    st.error("- Temporary service unavailability")
-                    st.info("Please check your API keys and try again in a few moments.")
-                    st.stop()
-                finally:
-                    sys.stdout = sys.__stdout__  # Reset stdout
-                
-            status.update(label="✅ Event Plan Ready!", state="complete", expanded=False)
+                    st.markdown('  \n'.join(runner.logs(job_id)), unsafe_allow_html=True)
+            # Sections appear here one by one as their agents finish
+            if job.sections:
+                st.markdown("---")
+                show_partial_plan(job, file_name)
+            # Poll until the job has finished
+            time.sleep(Config.get_jobs_config()['poll_interval'])
+            st.rerun()
+
+        if job.status != SUCCEEDED:
+            st.error(f"An error occurred while generating the event plan: {job.error}")
+            st.error("This might be due to:")
+            st.error("- API rate limits or connectivity issues")
+            st.error("- Invalid API keys")
+            st.error("- Temporary service unavailability")
+            st.info("Please check your API keys and try again in a few moments.")
+            if job.sections:
+                st.markdown("---")
+                show_partial_plan(job, file_name)
+            with st.expander("Agent log", expanded=False):
+                st.markdown('  \n'.join(job.log), unsafe_allow_html=True)
+            st.stop()
 
         # Display results
         st.markdown("---")
@@ -238,21 +248,21 @@ if __name__ == "__main__":
         col1, col2 = st.columns([6, 1])
         with col1:
             st.markdown("## 🎊 Your Complete Event Plan")
-        # Convert result to string for download and display
-        result_str = str(result)
-        st.session_state["event_plan_result"] = result_str  # Persist in session state
+        result_str = job.result
+        if job.from_cache:
+            st.caption("⚡ Served instantly from a plan generated earlier for the same event.")
         with col2:
             if st.download_button(
                 label="Download",
                 data=result_str,
-                file_name=f"event_plan_{event_description.replace(' ', '_').lower()}_{date_input.strftime('%Y%m%d')}.md",
+                file_name=file_name,
                 mime="text/markdown"
             ):
                 st.success("Plan downloaded!")
         
         # Display the plan with enhanced formatting
         try:
-            if isinstance(result, str) and result.strip():
+            if result_str.strip():
                 st.markdown(result_str)
             else:
                 st.warning("The event plan was generated but may be incomplete. Please try generating again.")
@@ -260,17 +270,32 @@ if __name__ == "__main__":
             st.error(f"Error displaying the plan: {str(e)}")
             st.text_area("Raw Plan Output:", value=result_str, height=400)
 
-    # If not submitted, but a plan exists in session_state, show it
-    elif "event_plan_result" in st.session_state:
-        st.markdown("---")
-        col1, col2 = st.columns([6, 1])
-        with col1:
-            st.markdown("## 🎊 Your Complete Event Plan")
-        with col2:
-            st.download_button(
-                label="Download",
-                data=st.session_state["event_plan_result"],
-                file_name="event_plan.md",
-                mime="text/markdown"
-            )
-        st.markdown(st.session_state["event_plan_result"])
\ No newline at end of file
+        with st.expander("Agent log", expanded=False):
+            st.markdown('  \n'.join(job.log), unsafe_allow_html=True)
+
+        # Per-run timing breakdown of agents, tools, HTTP requests and LLM calls
+        with st.expander("⏱️ Timing breakdown", expanded=False):
+            breakdown = recorder.breakdown(job.run_id) if job.run_id else []
+            if breakdown:
+                st.dataframe(
+                    [{**row, 'total_ms': round(row['total_ms'], 1)} for row in breakdown],
+                    use_container_width=True,
+                    hide_index=True
+                )
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.download_button(
+                        label="Download spans (JSON lines)",
+                        data=recorder.to_jsonl(job.run_id),
+                        file_name=f"event_plan_metrics_{job.run_id}.jsonl",
+                        mime="application/jsonl"
+                    )
+                with col2:
+                    st.download_button(
+                        label="Download metrics (Prometheus)",
+                        data=recorder.to_prometheus(),
+                        file_name="event_planner_metrics.prom",
+                        mime="text/plain"
+                    )
+            else:
+                st.caption("No timing data was recorded for this run.")
@@ -0,0 +1,181 @@
+"""
+Headless batch planning.
+
+Reads event specs from a JSONL file (one JSON object per line), plans them
+concurrently with EventCrew and appends each finished plan to an output JSONL
+file as soon as it is ready, then prints throughput statistics.
+
+Each spec needs event_description, location, people_count and event_datetime
+("YYYY-MM-DD HH:MM"); additional_details and id are optional.
+
+Usage: python batch_plan.py events.jsonl --output plans.jsonl --concurrency 4
+"""
+import sys
+
+# Same sqlite3 swap as app.py, for hosts whose system SQLite is too old for crewai
+try:
+    __import__('pysqlite3')
+    sys.modules['sqlite3'] = sys.modules.pop('pysqlite3')
+except ImportError:
+    pass
+
+import argparse
+import datetime
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from agent_log import AgentLog
+from config import Config
+from event_crew import EventCrew
+from jobs import current_job_log, install_log_router
+from plan_cache import load_plan, store_plan
+from prefetch import start_prefetch
+
+REQUIRED_FIELDS = ('event_description', 'location', 'people_count', 'event_datetime')
+
+# Lines of agent log kept with a failed plan
+FAILURE_LOG_LINES = 20
+
+
+def spec_to_inputs(spec: Dict[str, Any], today_str: str) -> Dict[str, Any]:
+    """Validate one spec and return the EventCrew keyword arguments for it."""
+    missing = [field for field in REQUIRED_FIELDS if not str(spec.get(field) or '').strip()]
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(missing)}")
+    people_count = int(spec['people_count'])
+    if people_count <= 0:
+        raise ValueError("people_count must be a positive number")
+    datetime.datetime.strptime(spec['event_datetime'], '%Y-%m-%d %H:%M')
+    return {
+        'event_description': spec['event_description'].strip(),
+        'location': spec['location'].strip(),
+        'people_count': people_count,
+        'event_datetime': spec['event_datetime'],
+        'additional_details': spec.get('additional_details') or '',
+        'today_str': spec.get('today_str') or today_str,
+    }
+
+
+def read_specs(path: str) -> Iterable[Tuple[int, Dict[str, Any]]]:
+    """Yield (line number, spec) for every non-blank line; unparsable lines yield an error spec."""
+    with open(path, encoding='utf-8') as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, {'_error': f"Invalid JSON: {e.msg}"}
+
+
+def plan_event(spec_id: Any, spec: Dict[str, Any], today_str: str, use_cache: bool = True) -> Dict[str, Any]:
+    """Plan one event and return its output record; errors are reported in the record, not raised."""
+    record = {'id': spec_id, 'status': 'succeeded', 'cached': False, 'plan': None, 'error': None}
+    started = time.perf_counter()
+    # Agent output goes to a per-event buffer instead of interleaving on the console
+    log = AgentLog(max_lines=FAILURE_LOG_LINES)
+    token = current_job_log.set(log)
+    try:
+        if '_error' in spec:
+            raise ValueError(spec['_error'])
+        inputs = spec_to_inputs(spec, today_str)
+        plan = load_plan(inputs) if use_cache else None
+        if plan is not None:
+            record['cached'] = True
+        else:
+            start_prefetch(inputs)
+            plan = EventCrew(**inputs).run()
+            if not plan:
+                raise RuntimeError("No event plan was generated.")
+            if use_cache:
+                store_plan(inputs, plan)
+        record['plan'] = plan
+    except Exception as e:
+        record['status'] = 'failed'
+        record['error'] = f"{type(e).__name__}: {str(e)}"
+        log.flush()
+        record['log_tail'] = log.snapshot()
+    finally:
+        current_job_log.reset(token)
+    record['seconds'] = round(time.perf_counter() - started, 3)
+    return record
+
+
+def run_batch(input_path: str, output_path: str, concurrency: int, use_cache: bool = True) -> Dict[str, Any]:
+    """Plan every spec in input_path, streaming records to output_path, and return throughput statistics."""
+    install_log_router()
+    today_str = datetime.date.today().strftime('%Y-%m-%d')
+    specs = list(read_specs(input_path))
+    latencies: List[float] = []
+    counts = {'succeeded': 0, 'failed': 0, 'cached': 0}
+
+    started = time.perf_counter()
+    with open(output_path, 'a', encoding='utf-8') as output, ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {
+            executor.submit(plan_event, spec.get('id', line_no), spec, today_str, use_cache): line_no
+            for line_no, spec in specs
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            record = future.result()
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+            output.flush()
+            counts[record['status']] += 1
+            if record['cached']:
+                counts['cached'] += 1
+            elif record['status'] == 'succeeded':
+                latencies.append(record['seconds'])
+            detail = 'cached' if record['cached'] else record['error'] or ''
+            # The real stream: sys.stderr is shared with the agents' output while plans run
+            print(f"[{done}/{len(specs)}] {record['status']:<9} {record['id']} {record['seconds']:.1f}s {detail}",
+                  file=sys.__stderr__, flush=True)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'total': len(specs),
+        **counts,
+        'concurrency': concurrency,
+        'elapsed_seconds': round(elapsed, 3),
+        'plans_per_minute': round(len(specs) / elapsed * 60, 2) if elapsed else 0.0,
+        'median_plan_seconds': round(statistics.median(latencies), 3) if latencies else None,
+        'p95_plan_seconds': round(_percentile(latencies, 0.95), 3) if latencies else None,
+    }
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input', help='JSONL file with one event spec per line')
+    parser.add_argument('--output', default='plans.jsonl', help='JSONL file finished plans are appended to')
+    parser.add_argument('--concurrency', type=int, default=Config.get_jobs_config()['max_workers'],
+                        help='Events planned at the same time (default: JOBS_MAX_WORKERS)')
+    parser.add_argument('--no-cache', action='store_true', help='Always run the agents, even for previously planned events')
+    args = parser.parse_args(argv)
+
+    if args.concurrency < 1:
+        parser.error('--concurrency must be at least 1')
+
+    stats = run_batch(args.input, args.output, args.concurrency, use_cache=not args.no_cache)
+    print(
+        f"\nPlanned {stats['total']} events in {stats['elapsed_seconds']:.1f}s "
+        f"({stats['plans_per_minute']:.1f} plans/min) with concurrency {stats['concurrency']}: "
+        f"{stats['succeeded']} succeeded ({stats['cached']} from cache), {stats['failed']} failed",
+        file=sys.__stdout__
+    )
+    if stats['median_plan_seconds'] is not None:
+        print(f"Per plan: median {stats['median_plan_seconds']:.1f}s, p95 {stats['p95_plan_seconds']:.1f}s",
+              file=sys.__stdout__)
+    return 1 if stats['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
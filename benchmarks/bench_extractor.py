@@ -0,0 +1,71 @@
+"""
+Micro-benchmark for the scraper's content extraction.
+
+Compares the original multi-pass soup.select extraction on html.parser with
+the single-pass tools.content_extractor on the saved venue page fixtures.
+
+Usage: python -m benchmarks.bench_extractor [--repeat 20]
+"""
+import argparse
+import glob
+import os
+import re
+import time
+
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+
+from tools.content_extractor import PARSER_BACKEND, extract
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def legacy_extract(html):
+    """The extraction previously inlined in BrowserTools.scrape_and_summarize_website."""
+    soup = BeautifulSoup(html, 'html.parser')
+    for script in soup(["script", "style"]):
+        script.decompose()
+    title = soup.find('title')
+    title_text = title.get_text().strip() if title else "No title found"
+    meta_desc = soup.find('meta', attrs={'name': 'description'})
+    description = str(meta_desc.get('content', '')).strip() if isinstance(meta_desc, Tag) else ""
+    content_areas = []
+    for selector in ['main', 'article', '.content', '#content', '.main-content', '.post-content']:
+        for element in soup.select(selector):
+            content_areas.append(element.get_text().strip())
+    if not content_areas:
+        paragraphs = soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+        content_areas = [p.get_text().strip() for p in paragraphs if p.get_text().strip()]
+    content_text = re.sub(r'\s+', ' ', ' '.join(content_areas)).strip()
+    return title_text, description, content_text
+
+
+def time_call(fn, html, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20, help='Runs per fixture; the best time is reported')
+    args = parser.parse_args()
+
+    print(f"Parser backend: {PARSER_BACKEND}")
+    print(f"{'fixture':<28}{'bytes':>9}{'legacy ms':>12}{'single ms':>12}{'speedup':>9}{'legacy chars':>14}{'single chars':>14}")
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html'))):
+        with open(path, 'rb') as f:
+            html = f.read()
+        legacy = time_call(legacy_extract, html, args.repeat)
+        single = time_call(extract, html, args.repeat)
+        legacy_chars = len(legacy_extract(html)[2])
+        single_chars = len(extract(html).text)
+        print(f"{os.path.basename(path):<28}{len(html):>9}{legacy * 1000:>12.2f}{single * 1000:>12.2f}"
+              f"{legacy / single:>8.1f}x{legacy_chars:>14}{single_chars:>14}")
+
+
+if __name__ == '__main__':
+    main()
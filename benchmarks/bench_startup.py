@@ -0,0 +1,96 @@
+"""
+Startup benchmark for the Streamlit app and the planning crew.
+
+Each measurement runs in a fresh interpreter so module imports are cold:
+- page_load: first run of app.py with no plan requested (what a new visitor waits for)
+- rerun: a second run of the same script, as on every form interaction
+- crew_imports: importing crewai, the agents and the tools when the first plan starts
+- agents_first / agents_pooled: building the five agents versus checking a set out of the pool
+
+Usage: python -m benchmarks.bench_startup [--repeat 3] [--max-page-load-ms 1500]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+APP_PROBE = '''
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file(sys.argv[1], default_timeout=120)
+start = time.perf_counter(); app.run(); page_load = time.perf_counter() - start
+start = time.perf_counter(); app.run(); rerun = time.perf_counter() - start
+print(json.dumps({
+    'page_load': page_load,
+    'rerun': rerun,
+    'crewai_loaded': 'crewai' in sys.modules,
+    'exception': bool(app.exception),
+}))
+'''
+
+CREW_PROBE = '''
+import json, time
+start = time.perf_counter()
+from event_agents import AgentPool
+crew_imports = time.perf_counter() - start
+pool = AgentPool(max_idle=1)
+start = time.perf_counter()
+with pool.checkout():
+    pass
+agents_first = time.perf_counter() - start
+start = time.perf_counter()
+with pool.checkout():
+    pass
+agents_pooled = time.perf_counter() - start
+print(json.dumps({'crew_imports': crew_imports, 'agents_first': agents_first, 'agents_pooled': agents_pooled}))
+'''
+
+
+def run_probe(code: str, *args: str) -> dict:
+    env = dict(os.environ)
+    env.setdefault('OPENAI_API_KEY', 'benchmark')
+    env.setdefault('SERPER_API_KEY', 'benchmark')
+    env['OTEL_SDK_DISABLED'] = 'true'
+    env['PYTHONPATH'] = ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    result = subprocess.run([sys.executable, '-c', code, *args], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3, help='Fresh interpreters per measurement; the median is reported')
+    parser.add_argument('--max-page-load-ms', type=float, help='Exit non-zero if the median cold page load is slower than this')
+    args = parser.parse_args()
+
+    samples = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ['CACHE_DIR'] = cache_dir
+        for _ in range(args.repeat):
+            app = run_probe(APP_PROBE, os.path.join(ROOT, 'app.py'))
+            if app['exception']:
+                sys.exit("app.py raised an exception while loading")
+            if app['crewai_loaded']:
+                print("Warning: crewai was imported by a plain page load")
+            for name in ('page_load', 'rerun'):
+                samples.setdefault(name, []).append(app[name])
+            for name, seconds in run_probe(CREW_PROBE).items():
+                samples.setdefault(name, []).append(seconds)
+
+    print(f"{'measurement':<18}{'median ms':>12}{'min ms':>12}")
+    for name, values in samples.items():
+        print(f"{name:<18}{statistics.median(values) * 1000:>12.1f}{min(values) * 1000:>12.1f}")
+
+    page_load_ms = statistics.median(samples['page_load']) * 1000
+    if args.max_page_load_ms and page_load_ms > args.max_page_load_ms:
+        print(f"\nCold page load of {page_load_ms:.0f} ms exceeds the {args.max_page_load_ms:.0f} ms budget")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
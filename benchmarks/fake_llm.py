@@ -0,0 +1,66 @@
+"""
+Deterministic stand-in for the OpenAI model used by the agents.
+
+On the first turn of each task it calls the agent's first tool with a canned
+input, then answers with a Final Answer derived from the task prompt. An
+optional sleep simulates provider latency so scheduling effects stay visible.
+"""
+import hashlib
+import json
+import re
+import time
+from typing import Any, Dict, List
+
+from crewai import LLM
+
+TOOL_INPUTS = {
+    'search_internet': {'query': 'corporate event venues Mumbai'},
+    'search_many': {'queries': ['corporate event venues Mumbai', 'conference halls Mumbai']},
+    'calculate': {'expression': '250 * 100'},
+    'calculate_batch': {'expressions': ['250 * 100', '15000 + 25000 + 10000']},
+    'estimate_budget': {
+        'line_items': [
+            {'item': 'venue', 'fixed_cost': 60000},
+            {'item': 'catering', 'per_person_cost': 900},
+            {'item': 'av', 'fixed_cost': 15000},
+        ],
+        'attendee_counts': [50],
+        'buffer_percent': 10,
+    },
+}
+
+TOOL_LIST = re.compile(r'only one name of \[([^\]]*)\]')
+
+
+class FakeLLM(LLM):
+    def __init__(self, latency: float = 0.0, **kwargs):
+        super().__init__(model=kwargs.pop('model', 'gpt-4o-mini'), **kwargs)
+        self.latency = latency
+        self.calls = 0
+
+    def call(self, messages: List[Dict[str, str]], callbacks: List[Any] = []) -> str:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        system = next((m['content'] for m in messages if m['role'] == 'system'), '')
+        task = next((m['content'] for m in messages if m['role'] == 'user'), '')
+        digest = hashlib.sha1(task.encode('utf-8')).hexdigest()[:8]
+
+        tools = TOOL_LIST.search(system)
+        tool_names = [name.strip() for name in tools.group(1).split(',')] if tools else []
+        already_acted = any(m['role'] == 'assistant' for m in messages)
+        tool = next((name for name in tool_names if name in TOOL_INPUTS), None)
+
+        if tool and not already_acted:
+            return (
+                f"Thought: I should use {tool} to research this.\n"
+                f"Action: {tool}\n"
+                f"Action Input: {json.dumps(TOOL_INPUTS[tool])}"
+            )
+        return (
+            "Thought: I now know the final answer\n"
+            f"Final Answer: Deterministic plan section {digest}.\n"
+            "- Option A: suitable for the stated headcount\n"
+            "- Option B: budget friendly alternative"
+        )
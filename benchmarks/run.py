@@ -0,0 +1,179 @@
+"""
+Offline benchmark suite for the tools and the full planning crew.
+
+Starts a local Serper stub and a local venue website, swaps in a deterministic
+fake LLM and times search, scrape, calculate and a complete EventCrew run.
+Results are written to a JSON report; pass --baseline to compare against an
+earlier report and exit non-zero on regressions.
+
+Usage: python -m benchmarks.run --output bench.json [--baseline baseline.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+
+def configure_environment(cache_dir: str, serper_url: str):
+    """Point every tool at the local stubs and keep caches out of the working tree."""
+    os.environ['CACHE_DIR'] = cache_dir
+    os.environ['SERPER_URL'] = serper_url
+    os.environ['SERPER_API_KEY'] = 'benchmark'
+    os.environ['OPENAI_API_KEY'] = 'benchmark'
+    os.environ['LLM_CACHE_MODE'] = 'off'
+    # Every crew run should exercise the agents rather than reuse task outputs
+    os.environ['TASK_CACHE_ENABLED'] = 'false'
+    # The stub search API has no quota; keep the shared rate limit from pacing the benchmark
+    os.environ['OUTBOUND_SEARCH_RATE'] = '1000'
+    os.environ['OUTBOUND_SEARCH_BURST'] = '1000'
+    # crewai telemetry would otherwise reach out to the network
+    os.environ['OTEL_SDK_DISABLED'] = 'true'
+    os.environ.setdefault('PAGE_CACHE_TTL', '3600')
+
+
+def measure(fn, repeat: int, setup=None, warmup: int = 0) -> dict:
+    timings = []
+    for run in range(warmup + repeat):
+        if setup:
+            setup()
+        # Tools print debug lines; keep them out of the timing and the report
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            fn()
+            elapsed = (time.perf_counter() - start) * 1000
+        if run >= warmup:
+            timings.append(elapsed)
+    return {
+        'median_ms': round(statistics.median(timings), 3),
+        'min_ms': round(min(timings), 3),
+        'runs': repeat,
+    }
+
+
+def run_benchmarks(args, site_url: str, site_paths) -> dict:
+    # Imported after configure_environment so Config picks up the stub endpoints
+    from benchmarks.fake_llm import FakeLLM
+    from event_crew import EventCrew
+    from tools.browser_tools import BrowserTools
+    from tools.calculator_tools import CalculatorTools
+    from tools.page_cache import get_page_cache
+    from tools.search_cache import get_search_cache
+    from tools.search_tools import SearchTools
+
+    search = SearchTools.search_internet
+    scrape = BrowserTools.scrape_and_summarize_website
+    page_url = f"{site_url}{site_paths[0]}"
+    expressions = [f"{rate} * {people} + 15%" for rate in range(200, 1200, 100) for people in (40, 50, 60)]
+
+    def set_page_ttl(ttl):
+        return lambda: os.environ.__setitem__('PAGE_CACHE_TTL', str(ttl))
+
+    results = {}
+    results['search_internet_cold'] = measure(
+        lambda: search.run({'query': 'corporate event venues Mumbai'}), args.repeat, setup=get_search_cache().clear)
+    results['search_internet_cached'] = measure(
+        lambda: search.run({'query': 'corporate event venues Mumbai'}), args.repeat)
+    results['search_many_cold'] = measure(
+        lambda: SearchTools.search_many.run({'queries': ['venues Mumbai', 'banquet halls Mumbai', 'conference hotels Mumbai']}),
+        args.repeat, setup=get_search_cache().clear)
+
+    results['scrape_cold'] = measure(
+        lambda: scrape.run({'website_url': page_url}), args.repeat, setup=get_page_cache().clear)
+    results['scrape_revalidated_304'] = measure(
+        lambda: scrape.run({'website_url': page_url}), args.repeat, setup=set_page_ttl(0))
+    results['scrape_fresh_cache'] = measure(
+        lambda: scrape.run({'website_url': page_url}), args.repeat, setup=set_page_ttl(3600))
+    results['scrape_many_cold'] = measure(
+        lambda: BrowserTools.scrape_many_websites.run({'website_urls': [f"{site_url}{path}" for path in site_paths]}),
+        args.repeat, setup=get_page_cache().clear)
+
+    results['calculate'] = measure(lambda: CalculatorTools.calculate.run({'expression': '250 * 100 + 15000'}), args.repeat)
+    results['calculate_batch_30'] = measure(
+        lambda: CalculatorTools.calculate_batch.run({'expressions': expressions}), args.repeat)
+
+    def clear_caches():
+        get_search_cache().clear()
+        get_page_cache().clear()
+
+    def crew_kickoff():
+        crew = EventCrew(
+            'Annual Sales Meet', 'Mumbai', 50, '2026-12-01 09:00', 'Vegetarian catering', '2026-10-17',
+            llm=FakeLLM(latency=args.llm_latency)
+        )
+        crew.run()
+
+    # The first run pays one-off crewai import and initialisation costs
+    results['crew_kickoff'] = measure(crew_kickoff, args.crew_repeat, setup=clear_caches, warmup=1)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Print a comparison table and return the names of benchmarks slower than the baseline by more than threshold."""
+    regressions = []
+    print(f"\n{'benchmark':<28}{'baseline ms':>14}{'current ms':>14}{'change':>10}")
+    for name, current in results.items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous:
+            print(f"{name:<28}{'-':>14}{current['median_ms']:>14.2f}{'new':>10}")
+            continue
+        change = current['median_ms'] / previous['median_ms'] - 1 if previous['median_ms'] else 0.0
+        flag = '  REGRESSION' if change > threshold else ''
+        print(f"{name:<28}{previous['median_ms']:>14.2f}{current['median_ms']:>14.2f}{change:>+9.0%}{flag}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', default='bench_report.json', help='Where to write the JSON report')
+    parser.add_argument('--baseline', help='Earlier JSON report to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed slowdown before flagging a regression (0.2 = 20%%)')
+    parser.add_argument('--repeat', type=int, default=10, help='Runs per tool benchmark')
+    parser.add_argument('--crew-repeat', type=int, default=3, help='Runs of the full crew benchmark')
+    parser.add_argument('--llm-latency', type=float, default=0.05, help='Simulated seconds per fake LLM call')
+    parser.add_argument('--network-latency', type=float, default=0.02, help='Simulated seconds per stub HTTP response')
+    args = parser.parse_args()
+
+    from benchmarks.stubs import StubServer, make_serper_handler, make_site_handler
+
+    site_handler = make_site_handler(args.network_latency)
+    with tempfile.TemporaryDirectory() as cache_dir, StubServer(site_handler) as site:
+        with StubServer(make_serper_handler(site.base_url, site_handler.paths, args.network_latency)) as serper:
+            configure_environment(cache_dir, f"{serper.base_url}/search")
+            results = run_benchmarks(args, site.base_url, site_handler.paths)
+
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'llm_latency': args.llm_latency,
+            'network_latency': args.network_latency,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    for name, result in results.items():
+        print(f"{name:<28}{result['median_ms']:>10.2f} ms (min {result['min_ms']:.2f}, {result['runs']} runs)")
+    print(f"\nReport written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Local stand-ins for google.serper.dev and venue websites.
+
+Both servers run on 127.0.0.1 in daemon threads and answer deterministically,
+so benchmarks measure our own code rather than the network or third-party APIs.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+class StubServer():
+    """Runs a request handler class on an ephemeral localhost port."""
+
+    def __init__(self, handler_class):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler_class)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class QuietHandler(BaseHTTPRequestHandler):
+    # Simulated server-side latency in seconds, set per server
+    latency = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_body(self, status: int, body: bytes, content_type: str, headers: dict = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_site_handler(latency: float = 0.0):
+    """Serve the HTML fixtures under /venues/<name>.html with ETag revalidation."""
+    pages = {}
+    for filename in sorted(os.listdir(FIXTURES_DIR)):
+        if filename.endswith('.html'):
+            with open(os.path.join(FIXTURES_DIR, filename), 'rb') as f:
+                body = f.read()
+            pages[f"/venues/{filename}"] = (body, '"' + hashlib.sha1(body).hexdigest() + '"')
+
+    class SiteHandler(QuietHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            page = pages.get(self.path)
+            if page is None:
+                self.send_body(404, b'Not found', 'text/plain')
+                return
+            body, etag = page
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            self.send_body(200, body, 'text/html; charset=utf-8', {'ETag': etag})
+
+    SiteHandler.paths = sorted(pages)
+    return SiteHandler
+
+
+def make_serper_handler(site_base_url: str, site_paths, latency: float = 0.0):
+    """Answer Serper search requests with organic results that point at the local venue site."""
+
+    class SerperHandler(QuietHandler):
+        def do_POST(self):
+            time.sleep(latency)
+            length = int(self.headers.get('Content-Length') or 0)
+            query = json.loads(self.rfile.read(length) or b'{}').get('q', '')
+            seed = int(hashlib.sha1(query.encode('utf-8')).hexdigest(), 16)
+            organic = []
+            for position in range(8):
+                path = site_paths[(seed + position) % len(site_paths)]
+                organic.append({
+                    'title': f"{query.title()} - Result {position + 1}",
+                    'link': f"{site_base_url}{path}?r={position}",
+                    'snippet': f"Result {position + 1} for '{query}'. Capacity, amenities and pricing for corporate events.",
+                    'position': position + 1,
+                })
+            self.send_body(200, json.dumps({'organic': organic}).encode('utf-8'), 'application/json')
+
+    return SerperHandler
@@ -1,5 +1,4 @@
 import os
-import streamlit as st
 from typing import Optional
 
 class Config:
@@ -30,7 +29,10 @@ class Config:
         """Get Serper API configuration"""
         return {
             'api_key': Config.get_api_key('SERPER_API_KEY'),
-            'max_results': int(Config.get_api_key('SERPER_MAX_RESULTS') or '4')
+            'url': Config.get_api_key('SERPER_URL') or 'https://google.serper.dev/search',
+            'max_results': int(Config.get_api_key('SERPER_MAX_RESULTS') or '4'),
+            'many_max_queries': int(Config.get_api_key('SERPER_MANY_MAX_QUERIES') or '5'),
+            'many_max_results': int(Config.get_api_key('SERPER_MANY_MAX_RESULTS') or '8')
         }
     
     @staticmethod
@@ -41,6 +43,212 @@ class Config:
             'timeout': int(Config.get_api_key('BROWSERLESS_TIMEOUT') or '30')
         }
     
+    @staticmethod
+    def get_http_config() -> dict:
+        """Get shared HTTP connection pool configuration"""
+        return {
+            'pool_connections': int(Config.get_api_key('HTTP_POOL_CONNECTIONS') or '20'),
+            'pool_maxsize': int(Config.get_api_key('HTTP_POOL_MAXSIZE') or '10'),
+            'pool_block': Config.get_api_key('HTTP_POOL_BLOCK') == 'true'
+        }
+    
+    @staticmethod
+    def get_scraper_config() -> dict:
+        """Get website scraper limits"""
+        return {
+            'timeout': int(Config.get_api_key('SCRAPER_TIMEOUT') or '10'),
+            'max_bytes': int(Config.get_api_key('SCRAPER_MAX_BYTES') or '1048576'),
+            'max_chars': int(Config.get_api_key('SCRAPER_MAX_CHARS') or '2000'),
+            'batch_max_urls': int(Config.get_api_key('SCRAPER_BATCH_MAX_URLS') or '8'),
+            'per_host_concurrency': int(Config.get_api_key('SCRAPER_PER_HOST_CONCURRENCY') or '2'),
+            'batch_deadline': float(Config.get_api_key('SCRAPER_BATCH_DEADLINE') or '30')
+        }
+    
+    @staticmethod
+    def get_outbound_config() -> dict:
+        """Get rate limiting, retry, hedging and circuit breaker settings for outbound calls"""
+        return {
+            'search_rate': float(Config.get_api_key('OUTBOUND_SEARCH_RATE') or '5'),
+            'search_burst': int(Config.get_api_key('OUTBOUND_SEARCH_BURST') or '5'),
+            'acquire_timeout': float(Config.get_api_key('OUTBOUND_ACQUIRE_TIMEOUT') or '30'),
+            'search_attempts': int(Config.get_api_key('OUTBOUND_SEARCH_ATTEMPTS') or '4'),
+            'scrape_attempts': int(Config.get_api_key('OUTBOUND_SCRAPE_ATTEMPTS') or '2'),
+            'retry_base_delay': float(Config.get_api_key('OUTBOUND_RETRY_BASE_DELAY') or '0.5'),
+            'retry_max_delay': float(Config.get_api_key('OUTBOUND_RETRY_MAX_DELAY') or '8'),
+            'hedge_after': float(Config.get_api_key('OUTBOUND_HEDGE_AFTER') or '2.5'),
+            'breaker_failures': int(Config.get_api_key('OUTBOUND_BREAKER_FAILURES') or '3'),
+            'breaker_reset': float(Config.get_api_key('OUTBOUND_BREAKER_RESET') or '60')
+        }
+    
+    @staticmethod
+    def get_cache_dir() -> str:
+        """Get the directory used for on-disk caches"""
+        return Config.get_api_key('CACHE_DIR') or '.cache'
+    
+    @staticmethod
+    def get_search_cache_config() -> dict:
+        """Get search result cache configuration"""
+        return {
+            'enabled': Config.get_api_key('SEARCH_CACHE_ENABLED') != 'false',
+            'path': Config.get_api_key('SEARCH_CACHE_PATH') or os.path.join(Config.get_cache_dir(), 'search_cache.sqlite3'),
+            'ttl_seconds': int(Config.get_api_key('SEARCH_CACHE_TTL') or '86400'),
+            'max_entries': int(Config.get_api_key('SEARCH_CACHE_MAX_ENTRIES') or '2000')
+        }
+    
+    @staticmethod
+    def get_prefetch_config() -> dict:
+        """Get speculative search prefetch configuration"""
+        return {
+            'enabled': Config.get_api_key('PREFETCH_ENABLED') != 'false',
+            'max_workers': int(Config.get_api_key('PREFETCH_MAX_WORKERS') or '8'),
+            'wait_seconds': float(Config.get_api_key('PREFETCH_WAIT') or '8')
+        }
+    
+    @staticmethod
+    def get_page_cache_config() -> dict:
+        """
+        Get scraped page cache configuration
+        PAGE_CACHE_DOMAIN_TTLS format: "example.com=86400,news.example.org=600"
+        """
+        domain_ttls = {}
+        for rule in (Config.get_api_key('PAGE_CACHE_DOMAIN_TTLS') or '').split(','):
+            if '=' in rule:
+                domain, ttl = rule.split('=', 1)
+                domain_ttls[domain.strip().lower()] = int(ttl.strip())
+        return {
+            'enabled': Config.get_api_key('PAGE_CACHE_ENABLED') != 'false',
+            'path': Config.get_api_key('PAGE_CACHE_PATH') or os.path.join(Config.get_cache_dir(), 'page_cache.sqlite3'),
+            'default_ttl': int(Config.get_api_key('PAGE_CACHE_TTL') or '3600'),
+            'domain_ttls': domain_ttls,
+            'max_age': int(Config.get_api_key('PAGE_CACHE_MAX_AGE') or '604800'),
+            'max_entries': int(Config.get_api_key('PAGE_CACHE_MAX_ENTRIES') or '500')
+        }
+    
+    @staticmethod
+    def get_llm_cache_config() -> dict:
+        """
+        Get LLM response cache configuration
+        LLM_CACHE_MODE: off, read_write (default), record or replay
+        """
+        mode = (Config.get_api_key('LLM_CACHE_MODE') or 'read_write').lower()
+        if mode not in ('off', 'read_write', 'record', 'replay'):
+            raise ValueError(f"Invalid LLM_CACHE_MODE '{mode}'. Use off, read_write, record or replay.")
+        return {
+            'mode': mode,
+            'path': Config.get_api_key('LLM_CACHE_PATH') or os.path.join(Config.get_cache_dir(), 'llm_cache.sqlite3'),
+            'ttl_seconds': int(Config.get_api_key('LLM_CACHE_TTL') or '604800'),
+            'max_entries': int(Config.get_api_key('LLM_CACHE_MAX_ENTRIES') or '5000')
+        }
+    
+    @staticmethod
+    def get_plan_cache_config() -> dict:
+        """Get finished plan cache configuration"""
+        return {
+            'enabled': Config.get_api_key('PLAN_CACHE_ENABLED') != 'false',
+            'path': Config.get_api_key('PLAN_CACHE_PATH') or os.path.join(Config.get_cache_dir(), 'plan_cache.sqlite3'),
+            'ttl_seconds': int(Config.get_api_key('PLAN_CACHE_TTL') or '86400'),
+            'max_entries': int(Config.get_api_key('PLAN_CACHE_MAX_ENTRIES') or '500')
+        }
+    
+    @staticmethod
+    def get_task_cache_config() -> dict:
+        """Get per-task output memoization configuration"""
+        return {
+            'enabled': Config.get_api_key('TASK_CACHE_ENABLED') != 'false',
+            'path': Config.get_api_key('TASK_CACHE_PATH') or os.path.join(Config.get_cache_dir(), 'task_cache.sqlite3'),
+            'ttl_seconds': int(Config.get_api_key('TASK_CACHE_TTL') or '86400'),
+            'max_entries': int(Config.get_api_key('TASK_CACHE_MAX_ENTRIES') or '2000')
+        }
+    
+    @staticmethod
+    def get_venue_catalog_config() -> dict:
+        """Get local venue catalog configuration"""
+        return {
+            'enabled': Config.get_api_key('VENUE_CATALOG_ENABLED') != 'false',
+            'path': Config.get_api_key('VENUE_CATALOG_PATH') or os.path.join(Config.get_cache_dir(), 'venue_catalog.sqlite3'),
+            'max_age': int(Config.get_api_key('VENUE_CATALOG_MAX_AGE') or '2592000'),
+            'max_results': int(Config.get_api_key('VENUE_CATALOG_MAX_RESULTS') or '5')
+        }
+    
+    @staticmethod
+    def get_token_budget_config() -> dict:
+        """
+        Get tool output compression configuration
+        TOKEN_BUDGET_AGENT_LIMITS format: "Venue Finder=4000,Budget Analyst=2000" (tokens per agent task)
+        """
+        agent_limits = {}
+        for rule in (Config.get_api_key('TOKEN_BUDGET_AGENT_LIMITS') or '').split(','):
+            if '=' in rule:
+                agent, limit = rule.split('=', 1)
+                agent_limits[agent.strip()] = int(limit.strip())
+        return {
+            'enabled': Config.get_api_key('TOKEN_BUDGET_ENABLED') != 'false',
+            'agent_limit': int(Config.get_api_key('TOKEN_BUDGET_AGENT_LIMIT') or '3000'),
+            'agent_limits': agent_limits,
+            'tool_output_tokens': int(Config.get_api_key('TOKEN_BUDGET_TOOL_OUTPUT') or '350'),
+            'min_output_tokens': int(Config.get_api_key('TOKEN_BUDGET_MIN_OUTPUT') or '100')
+        }
+    
+    @staticmethod
+    def get_llm_profiles_config() -> dict:
+        """
+        Get per-agent LLM profiles (theme, agenda, venue, travel, budget)
+        LLM_PROFILE_<NAME>_MODEL, _MAX_TOKENS, _TIMEOUT and _FALLBACK_AT override one profile;
+        fallback_at is the share of the agent's max_execution_time after which LLM_FALLBACK_MODEL is used
+        """
+        default_model = Config.get_api_key('OPENAI_MODEL_NAME') or 'gpt-4o-mini'
+        fast_model = Config.get_api_key('LLM_FAST_MODEL') or 'gpt-4o-mini'
+        # Theme and travel suggestions do well on the fast model; venue and budget keep the default
+        # model longest since their answers carry the facts and numbers of the plan
+        defaults = {
+            'theme': (fast_model, 1000, 60, 0.6),
+            'agenda': (default_model, 1500, 60, 0.6),
+            'venue': (default_model, 2000, 90, 0.85),
+            'travel': (fast_model, 1000, 60, 0.6),
+            'budget': (default_model, 2000, 90, 0.85),
+        }
+        profiles = {}
+        for name, (model, max_tokens, timeout, fallback_at) in defaults.items():
+            prefix = f'LLM_PROFILE_{name.upper()}_'
+            profiles[name] = {
+                'model': Config.get_api_key(prefix + 'MODEL') or model,
+                'max_tokens': int(Config.get_api_key(prefix + 'MAX_TOKENS') or max_tokens),
+                'timeout': float(Config.get_api_key(prefix + 'TIMEOUT') or timeout),
+                'fallback_at': float(Config.get_api_key(prefix + 'FALLBACK_AT') or fallback_at)
+            }
+        return {
+            'enabled': Config.get_api_key('LLM_ROUTING_ENABLED') != 'false',
+            'fallback_model': Config.get_api_key('LLM_FALLBACK_MODEL') or fast_model,
+            'profiles': profiles
+        }
+    
+    @staticmethod
+    def get_metrics_config() -> dict:
+        """Get instrumentation configuration"""
+        return {
+            'enabled': Config.get_api_key('METRICS_ENABLED') != 'false',
+            'jsonl_path': Config.get_api_key('METRICS_JSONL_PATH')
+        }
+    
+    @staticmethod
+    def get_crew_config() -> dict:
+        """Get agent scheduling configuration"""
+        return {
+            'max_workers': int(Config.get_api_key('CREW_MAX_WORKERS') or '5'),
+            'agent_pool_size': int(Config.get_api_key('CREW_AGENT_POOL_SIZE') or '4')
+        }
+    
+    @staticmethod
+    def get_jobs_config() -> dict:
+        """Get background plan job configuration"""
+        return {
+            'max_workers': int(Config.get_api_key('JOBS_MAX_WORKERS') or '2'),
+            'path': Config.get_api_key('JOBS_DB_PATH') or os.path.join(Config.get_cache_dir(), 'jobs.sqlite3'),
+            'max_jobs': int(Config.get_api_key('JOBS_MAX_STORED') or '500'),
+            'max_log_lines': int(Config.get_api_key('JOBS_MAX_LOG_LINES') or '200'),
+            'poll_interval': float(Config.get_api_key('JOBS_POLL_INTERVAL') or '1.0')
+        }
+    
     @staticmethod
     def validate_required_keys() -> tuple[bool, list[str]]:
         """
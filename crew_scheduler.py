@@ -0,0 +1,82 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class TaskNode():
+    """A unit of work in the plan graph and the names of the nodes it depends on."""
+
+    def __init__(self, name: str, fn: Callable[[Dict[str, Any]], Any], depends_on: Iterable[str] = ()):
+        self.name = name
+        self.fn = fn
+        self.depends_on = tuple(depends_on)
+
+
+class DagScheduler():
+    """
+    Runs task nodes on a thread pool as soon as their dependencies have finished.
+    Each node receives only the outputs of the nodes it depends on, so wall-clock
+    time is bounded by the critical path rather than the sum of all nodes.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        self.nodes: Dict[str, TaskNode] = {}
+
+    def add(self, name: str, fn: Callable[[Dict[str, Any]], Any], depends_on: Iterable[str] = ()) -> "DagScheduler":
+        if name in self.nodes:
+            raise ValueError(f"Duplicate task node: {name}")
+        self.nodes[name] = TaskNode(name, fn, depends_on)
+        return self
+
+    def order(self) -> List[str]:
+        """Return node names in a valid topological order, raising on unknown or cyclic dependencies."""
+        for node in self.nodes.values():
+            for dep in node.depends_on:
+                if dep not in self.nodes:
+                    raise ValueError(f"Task node '{node.name}' depends on unknown node '{dep}'")
+
+        ordered = []
+        remaining = {name: set(node.depends_on) for name, node in self.nodes.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Dependency cycle between task nodes: {', '.join(sorted(remaining))}")
+            for name in ready:
+                ordered.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return ordered
+
+    def run(self) -> Dict[str, Any]:
+        """Execute every node and return their outputs keyed by node name."""
+        pending = self.order()
+        results: Dict[str, Any] = {}
+        if not pending:
+            return results
+
+        max_workers = self.max_workers or len(pending)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        running = {}
+        try:
+            while pending or running:
+                for name in list(pending):
+                    node = self.nodes[name]
+                    if all(dep in results for dep in node.depends_on):
+                        upstream = {dep: results[dep] for dep in node.depends_on}
+                        # Each node runs in a copy of the caller's context so run-scoped context variables carry over
+                        context = contextvars.copy_context()
+                        running[executor.submit(context.run, node.fn, upstream)] = name
+                        pending.remove(name)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    # Re-raises the node's exception and aborts the remaining graph
+                    results[name] = future.result()
+        finally:
+            for future in running:
+                future.cancel()
+            executor.shutdown(wait=True, cancel_futures=True)
+        return results
@@ -1,17 +1,43 @@
 from crewai import Agent
-import re
-import streamlit as st
-from langchain_community.llms import OpenAI
+from crewai.agents.cache import CacheHandler
+import threading
+from contextlib import contextmanager
+from config import Config
+from llm_router import create_agent_llm
+from metrics import record_step
 from tools.browser_tools import BrowserTools
+from tools.budget_tools import BudgetTools
 from tools.calculator_tools import CalculatorTools
 from tools.search_tools import SearchTools
+from tools.venue_tools import VenueTools
+
+# Seconds each agent may spend on its task; the LLM router switches to a faster model near the limit
+MAX_EXECUTION_TIME = {
+    'theme': 120,  # Timeout after 2 minutes
+    'agenda': 120,
+    'venue': 180,  # 3 minutes for venue research
+    'travel': 120,
+    'budget': 150,  # 2.5 minutes for budget analysis
+}
 
 class EventAgents():
-    def __init__(self):
+    def __init__(self, llm=None):
         # Initialize tool instances
         self.search_tools = SearchTools()
         self.calculator_tools = CalculatorTools()
         self.browser_tools = BrowserTools()
+        self.budget_tools = BudgetTools()
+        self.venue_tools = VenueTools()
+        # A given llm is shared by all agents; otherwise each agent gets the client of its LLM profile
+        self.llm = llm
+        self._profile_llms = {}
+    
+    def llm_for(self, profile):
+        if self.llm is not None:
+            return self.llm
+        if profile not in self._profile_llms:
+            self._profile_llms[profile] = create_agent_llm(profile, MAX_EXECUTION_TIME[profile])
+        return self._profile_llms[profile]
     
     def theme_expert(self):
         return Agent(
@@ -20,10 +46,13 @@ class EventAgents():
             backstory='An expert in corporate event themes and branding with extensive knowledge of current trends and creative concepts.',
             tools=[
                 self.search_tools.search_internet,
+                self.search_tools.search_many,
             ],
+            llm=self.llm_for('theme'),
+            step_callback=record_step,
             verbose=True,
             max_iter=3,  # Limit iterations to prevent loops
-            max_execution_time=120,  # Timeout after 2 minutes
+            max_execution_time=MAX_EXECUTION_TIME['theme'],
         )
 
     def agenda_planner(self):
@@ -33,10 +62,13 @@ class EventAgents():
             backstory='A professional event manager with 10+ years of experience in planning corporate event schedules and optimizing attendee engagement.',
             tools=[
                 self.search_tools.search_internet,
+                self.search_tools.search_many,
             ],
+            llm=self.llm_for('agenda'),
+            step_callback=record_step,
             verbose=True,
             max_iter=3,
-            max_execution_time=120,
+            max_execution_time=MAX_EXECUTION_TIME['agenda'],
         )
 
     def venue_finder(self):
@@ -45,12 +77,16 @@ class EventAgents():
             goal='Find and summarize the best venues in the given location for the event',
             backstory='A venue sourcing specialist with deep knowledge of event spaces, capacity requirements, and venue amenities across different locations.',
             tools=[
+                self.venue_tools.search_venue_catalog,
                 self.search_tools.search_internet,
                 self.browser_tools.scrape_and_summarize_website,
+                self.browser_tools.scrape_many_websites,
             ],
+            llm=self.llm_for('venue'),
+            step_callback=record_step,
             verbose=True,
             max_iter=4,  # Allow more iterations for venue research
-            max_execution_time=180,  # 3 minutes for venue research
+            max_execution_time=MAX_EXECUTION_TIME['venue'],
         )
 
     def travel_logistics_expert(self):
@@ -60,10 +96,13 @@ class EventAgents():
             backstory='A logistics coordinator specializing in corporate events with expertise in transportation planning and cost-effective travel solutions.',
             tools=[
                 self.search_tools.search_internet,
+                self.search_tools.search_many,
             ],
+            llm=self.llm_for('travel'),
+            step_callback=record_step,
             verbose=True,
             max_iter=3,
-            max_execution_time=120,
+            max_execution_time=MAX_EXECUTION_TIME['travel'],
         )
 
     def budget_analyst(self):
@@ -72,58 +111,79 @@ class EventAgents():
             goal='Estimate the total event cost in INR, including venue, travel, food, and other expenses',
             backstory='A finance expert with 8+ years of experience in event budgeting, cost estimation, and financial planning for corporate events.',
             tools=[
+                self.budget_tools.estimate_budget,
                 self.calculator_tools.calculate,
+                self.calculator_tools.calculate_batch,
                 self.search_tools.search_internet,
             ],
+            llm=self.llm_for('budget'),
+            step_callback=record_step,
             verbose=True,
             max_iter=4,  # Allow more iterations for complex calculations
-            max_execution_time=150,  # 2.5 minutes for budget analysis
+            max_execution_time=MAX_EXECUTION_TIME['budget'],
         )
 
-class StreamToExpander:
-    def __init__(self, expander):
-        self.expander = expander
-        self.buffer = []
-        self.colors = ['red', 'green', 'blue', 'orange']  # Define a list of colors
-        self.color_index = 0  # Initialize color index
-
-    def write(self, data):
-        # Filter out ANSI escape codes using a regular expression
-        cleaned_data = re.sub(r'\x1B\[[0-9;]*[mK]', '', data)
-
-        # Check if the data contains 'task' information
-        task_match_object = re.search(r'"task"\s*:\s*"(.*?)"', cleaned_data, re.IGNORECASE)
-        task_match_input = re.search(r'task\s*:\s*([^\n]*)', cleaned_data, re.IGNORECASE)
-        task_value = None
-        if task_match_object:
-            task_value = task_match_object.group(1)
-        elif task_match_input:
-            task_value = task_match_input.group(1).strip()
-
-        # Remove st.toast to avoid annoying toasts
-        # if task_value:
-        #     st.toast(":robot_face: " + task_value)
-
-        # Check if the text contains the specified phrase and apply color
-        if "Entering new CrewAgentExecutor chain" in cleaned_data:
-            # Apply different color and switch color index
-            self.color_index = (self.color_index + 1) % len(self.colors)  # Increment color index and wrap around if necessary
-            cleaned_data = cleaned_data.replace("Entering new CrewAgentExecutor chain", f":{self.colors[self.color_index]}[Entering new CrewAgentExecutor chain]")
-
-        if "Theme Expert" in cleaned_data:
-            cleaned_data = cleaned_data.replace("Theme Expert", f":{self.colors[self.color_index]}[Theme Expert]")
-        if "Agenda Planner" in cleaned_data:
-            cleaned_data = cleaned_data.replace("Agenda Planner", f":{self.colors[self.color_index]}[Agenda Planner]")
-        if "Venue Finder" in cleaned_data:
-            cleaned_data = cleaned_data.replace("Venue Finder", f":{self.colors[self.color_index]}[Venue Finder]")
-        if "Travel & Logistics Expert" in cleaned_data:
-            cleaned_data = cleaned_data.replace("Travel & Logistics Expert", f":{self.colors[self.color_index]}[Travel & Logistics Expert]")
-        if "Budget Analyst" in cleaned_data:
-            cleaned_data = cleaned_data.replace("Budget Analyst", f":{self.colors[self.color_index]}[Budget Analyst]")
-        if "Finished chain." in cleaned_data:
-            cleaned_data = cleaned_data.replace("Finished chain.", f":{self.colors[self.color_index]}[Finished chain.]")
-
-        self.buffer.append(cleaned_data)
-        if "\n" in data:
-            self.expander.markdown(''.join(self.buffer), unsafe_allow_html=True)
-            self.buffer = []
\ No newline at end of file
+
+class AgentPool():
+    """
+    Reusable sets of the five agents sharing one set of tools and one LLM client.
+    A crewai Agent keeps per-task executor state, so every plan checks out a set of
+    its own; finished sets are reset and kept for the next plan instead of rebuilt.
+    """
+
+    def __init__(self, llm=None, max_idle=4):
+        self.llm = llm
+        self.max_idle = max_idle
+        self.created = 0
+        self._factory = None
+        self._idle = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def checkout(self):
+        """Yield a dict of agents keyed by task name for the duration of one plan."""
+        with self._lock:
+            agents = self._idle.pop() if self._idle else None
+            if self._factory is None:
+                self._factory = EventAgents(llm=self.llm)
+        if agents is None:
+            agents = self._build()
+        try:
+            yield agents
+        finally:
+            self._reset(agents)
+            with self._lock:
+                if len(self._idle) < self.max_idle:
+                    self._idle.append(agents)
+
+    def _build(self):
+        with self._lock:
+            self.created += 1
+        return {
+            'theme': self._factory.theme_expert(),
+            'agenda': self._factory.agenda_planner(),
+            'venue': self._factory.venue_finder(),
+            'travel': self._factory.travel_logistics_expert(),
+            'budget': self._factory.budget_analyst(),
+        }
+
+    @staticmethod
+    def _reset(agents):
+        # Drop tool results, crewai's in-memory tool cache and the retry count of the last plan
+        for agent in agents.values():
+            agent.tools_results = []
+            agent._times_executed = 0
+            agent.set_cache_handler(CacheHandler())
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_agent_pool():
+    """Return the process-wide agent pool used by plans that do not bring their own LLM."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = AgentPool(max_idle=Config.get_crew_config()['agent_pool_size'])
+    return _pool
@@ -0,0 +1,113 @@
+import uuid
+
+from config import Config
+from crew_scheduler import DagScheduler
+from metrics import agent_context, annotate, run_context, span
+from task_cache import load_output, store_output, task_key
+
+
+class EventCrew:
+    # Names of the plan sections in the order they appear in the final plan
+    TASK_NAMES = ("theme", "agenda", "venue", "travel", "budget")
+    SECTION_TITLES = {
+        "theme": "🎨 Theme Suggestions",
+        "agenda": "📅 Event Agenda",
+        "venue": "🏢 Venue Options",
+        "travel": "🚗 Travel & Logistics",
+        "budget": "💰 Budget Estimate",
+    }
+
+    def __init__(self, event_description, location, people_count, event_datetime, additional_details, today_str,
+                 llm=None, on_task_complete=None, agent_pool=None):
+        self.event_description = event_description
+        self.location = location
+        self.people_count = people_count
+        self.event_datetime = event_datetime
+        self.additional_details = additional_details
+        self.today_str = today_str
+        self.llm = llm
+        # Reusable agents; defaults to the process-wide pool, or fresh agents when a custom llm is given
+        self.agent_pool = agent_pool
+        # Called with (task name, task output) from the worker thread as each task finishes
+        self.on_task_complete = on_task_complete
+        # Tags the timing spans of this run for the per-run breakdown
+        self.run_id = uuid.uuid4().hex
+
+    def run(self):
+        # crewai and the tools are imported on the first plan rather than at app start
+        from event_agents import AgentPool, get_agent_pool
+
+        pool = self.agent_pool or (AgentPool(llm=self.llm, max_idle=0) if self.llm else get_agent_pool())
+        with run_context(self.run_id), span('crew', 'run'), pool.checkout() as agents:
+            return self._run(agents)
+
+    def _run(self, agents):
+        from event_tasks import EventTasks
+
+        tasks = EventTasks()
+
+        theme_expert = agents['theme']
+        agenda_planner = agents['agenda']
+        venue_finder = agents['venue']
+        travel_logistics_expert = agents['travel']
+        budget_analyst = agents['budget']
+
+        theme_task = tasks.theme_task(theme_expert, self.event_description, self.additional_details, self.today_str)
+        agenda_task = tasks.agenda_task(agenda_planner, self.event_description, self.people_count, self.event_datetime, self.additional_details, self.today_str)
+        venue_task = tasks.venue_task(venue_finder, self.location, self.people_count, self.event_datetime, self.additional_details, self.today_str)
+        travel_task = tasks.travel_task(travel_logistics_expert, self.location, self.people_count, self.event_datetime, self.additional_details, self.today_str)
+        budget_task = tasks.budget_task(budget_analyst, self.location, self.people_count, self.event_datetime, self.additional_details, self.today_str)
+
+        # Only the agenda builds on the themes and the budget on the venues;
+        # everything else runs concurrently
+        plan = [
+            ("theme", theme_task, ()),
+            ("agenda", agenda_task, ("theme",)),
+            ("venue", venue_task, ()),
+            ("travel", travel_task, ()),
+            ("budget", budget_task, ("venue",)),
+        ]
+
+        scheduler = DagScheduler(max_workers=Config.get_crew_config()['max_workers'])
+        for name, task, depends_on in plan:
+            scheduler.add(name, self._task_runner(name, task), depends_on)
+
+        outputs = scheduler.run()
+
+        return self.combine({name: self._output_text(outputs[name]) for name, _, _ in plan})
+
+    @classmethod
+    def combine(cls, sections):
+        """Join section texts into one markdown plan in the usual order; missing sections are left out."""
+        return "\n\n---\n\n".join(
+            f"### {cls.SECTION_TITLES[name]}\n{sections[name]}" for name in cls.TASK_NAMES if sections.get(name)
+        )
+
+    @staticmethod
+    def _output_text(task_output):
+        # Each task_output may have .raw or .output or similar
+        if hasattr(task_output, "raw"):
+            return task_output.raw
+        return str(task_output)
+
+    def _task_runner(self, name, task):
+        def run(upstream):
+            # Pass only the outputs of the tasks this one depends on as context
+            upstream_texts = [self._output_text(output) for output in upstream.values()]
+            context = "\n\n".join(upstream_texts)
+            # Tasks whose inputs and upstream outputs are unchanged reuse their earlier output
+            key = task_key(name, task.description, task.expected_output, getattr(task.agent.llm, 'model', ''), upstream_texts)
+            with agent_context(task.agent.role), span('task', name) as current:
+                output = load_output(key)
+                # A reused section shows up as cache_hit on the task span
+                annotate(cache_hit=output is not None)
+                if output is None:
+                    output = task.execute_sync(context=context or None)
+                    # The key names the agent's own model; an answer the fallback model
+                    # (partly) wrote is not stored under it
+                    if 'llm_fallback' not in current.attrs:
+                        store_output(key, self._output_text(output))
+            if self.on_task_complete is not None:
+                self.on_task_complete(name, output)
+            return output
+        return run
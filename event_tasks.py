@@ -1,6 +1,7 @@
 from crewai import Task
 from textwrap import dedent
 from datetime import date
+from task_queries import example_query
 
 class EventTasks():
     def theme_task(self, agent, event_description, additional_details, today_str):
@@ -24,7 +25,9 @@ class EventTasks():
                 
                 When using the search tool, always provide your query as a JSON string in this format:
                 {{"query": "your search query here"}}
-                Example: {{"query": "creative office party themes 2025"}}
+                Example: {{"query": "{example_query('theme')}"}}
+                To research several related angles at once, use the search_many tool with a list of queries:
+                {{"queries": ["first search query", "second search query"]}}
             """),
             expected_output="A detailed list of 3-5 creative event theme suggestions with descriptions, decorative elements, and rationale for each theme.",
             agent=agent
@@ -54,7 +57,9 @@ class EventTasks():
                 
                 When using the search tool, always provide your query as a JSON string in this format:
                 {{"query": "your search query here"}}
-                Example: {{"query": "corporate event agenda template"}}
+                Example: {{"query": "{example_query('agenda')}"}}
+                To research several related angles at once, use the search_many tool with a list of queries:
+                {{"queries": ["first search query", "second search query"]}}
             """),
             expected_output="A detailed, time-based agenda for the event with specific activities, duration, and logistics for each segment.",
             agent=agent
@@ -82,13 +87,18 @@ class EventTasks():
                 5. Contact information
                 6. Why this venue is suitable for the event
                 
-                Use the search tool to find venues, then use the browser tool to get detailed information from venue websites.
+                First check the local venue catalog, which holds venues researched for earlier events:
+                {{"location": "{location}", "people_count": {people_count}}}
+                If it returns at least 3 suitable venues, build your answer from them and only scrape their websites for missing details.
+                Otherwise, use the search tool to find more venues, then use the browser tool to get detailed information from venue websites.
                 
                 When using the search tool, always provide your query as a JSON string in this format:
                 {{"query": "your search query here"}}
-                Example: {{"query": "corporate event venues {location}"}}
+                Example: {{"query": "{example_query('venue', location=location)}"}}
                 
                 When using the browser tool, provide complete URLs starting with https://
+                To research several venues at once, pass all their URLs to the scrape_many_websites tool in a single call:
+                {{"website_urls": ["https://venue-one.example", "https://venue-two.example"]}}
             """),
             expected_output="A comprehensive list of 3-5 suitable venues with detailed information including capacity, amenities, pricing, and contact details.",
             agent=agent
@@ -121,7 +131,9 @@ class EventTasks():
                 
                 When using the search tool, always provide your query as a JSON string in this format:
                 {{"query": "your search query here"}}
-                Example: {{"query": "transportation options {location}"}}
+                Example: {{"query": "{example_query('travel', location=location)}"}}
+                To research several related angles at once, use the search_many tool with a list of queries:
+                {{"queries": ["first search query", "second search query"]}}
             """),
             expected_output="Comprehensive travel recommendations including local transport, inter-city options, and group transportation suggestions with estimated travel times.",
             agent=agent
@@ -152,15 +164,23 @@ class EventTasks():
                 
                 IMPORTANT: Do NOT include transportation or travel costs as these will be handled by individual attendees.
                 
-                Research current market rates in the specified location and use the calculator tool for all mathematical computations.
+                Research current market rates in the specified location, then pass the rates for every line item to the
+                estimate_budget tool in a single call. It computes the itemized costs, buffer, total and cost per person for you:
+                {{"line_items": [{{"item": "venue", "fixed_cost": 60000}}, {{"item": "catering", "per_person_cost": 900}}],
+                  "attendee_counts": [{people_count}], "buffer_percent": 10}}
+                Line items: venue, catering, av, decor, photography, stationery, entertainment.
+                Use the calculator tool only for any additional computations.
                 
                 When using the search tool, always provide your query as a JSON string in this format:
                 {{"query": "your search query here"}}
-                Example: {{"query": "corporate event costs {location} per person"}}
+                Example: {{"query": "{example_query('budget', location=location)}"}}
                 
                 For calculations, use simple expressions like:
                 - "250 * 100" (for per person costs)
                 - "15000 + 25000 + 10000" (for adding different cost components)
+                
+                To compute several line items at once, pass them all to the calculate_batch tool in one call:
+                {{"expressions": ["250 * 100", "15000 + 25000 + 10000", "12% of 90000"]}}
             """),
             expected_output="A detailed budget breakdown in INR with itemized costs for all event components (excluding transportation), total estimated cost, and cost per person.",
             agent=agent
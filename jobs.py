@@ -0,0 +1,298 @@
+"""
+Background plan generation jobs.
+
+Plans run on a worker pool owned by the Streamlit server process, so the script
+thread only submits a job and polls its progress. Agent output is captured per
+job by routing stdout writes through a context variable instead of swapping the
+global sys.stdout, and finished jobs are kept in SQLite so results survive page
+refreshes and server restarts.
+"""
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+from agent_log import AgentLog
+from config import Config
+from event_crew import EventCrew
+from plan_cache import load_plan, store_plan
+from prefetch import start_prefetch
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+INTERRUPTED = 'interrupted'
+FINISHED_STATES = (SUCCEEDED, FAILED, INTERRUPTED)
+
+current_job_log: ContextVar[Optional[AgentLog]] = ContextVar('current_job_log', default=None)
+
+# litellm help banners crewai used to filter out by swapping sys.stdout during LLM calls
+LITELLM_NOISE = (
+    "Give Feedback / Get Help: https://github.com/BerriAI/litellm/issues/new",
+    "LiteLLM.Info: If you need to debug this error, use `litellm.set_verbose=True`",
+)
+
+
+class LogRouter():
+    """
+    stdout replacement that sends each write to the log of the job running in the
+    current context and everything else to the original stream. It is installed
+    once per process; worker threads inherit the job's log through copied contexts.
+    """
+
+    def __init__(self, fallback):
+        self.fallback = fallback
+
+    def write(self, data):
+        if any(noise in data for noise in LITELLM_NOISE):
+            return len(data)
+        log = current_job_log.get()
+        if log is not None:
+            return log.write(data)
+        return self.fallback.write(data)
+
+    def flush(self):
+        log = current_job_log.get()
+        if log is not None:
+            log.flush()
+        else:
+            self.fallback.flush()
+
+    def __getattr__(self, name):
+        # isatty, encoding, fileno etc. come from the real stream
+        return getattr(self.fallback, name)
+
+
+_router_lock = threading.Lock()
+
+
+def install_log_router() -> None:
+    with _router_lock:
+        if not isinstance(sys.stdout, LogRouter):
+            sys.stdout = LogRouter(sys.stdout)
+
+
+class Job():
+    def __init__(self, job_id: str, status: str, inputs: Dict[str, Any], run_id: Optional[str] = None,
+                 completed: Optional[List[str]] = None, sections: Optional[Dict[str, str]] = None,
+                 result: Optional[str] = None,
+                 error: Optional[str] = None, log: Optional[List[str]] = None,
+                 created_at: float = 0.0, updated_at: float = 0.0):
+        self.id = job_id
+        self.status = status
+        self.inputs = inputs
+        self.run_id = run_id
+        self.completed = completed or []
+        self.sections = sections or {}
+        self.result = result
+        self.error = error
+        self.log = log or []
+        self.created_at = created_at
+        self.updated_at = updated_at
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    @property
+    def progress(self) -> float:
+        return len(self.completed) / len(EventCrew.TASK_NAMES)
+
+    @property
+    def partial_plan(self) -> str:
+        """Markdown of the sections finished so far."""
+        return EventCrew.combine(self.sections)
+
+    @property
+    def from_cache(self) -> bool:
+        # Plans served from the plan cache never start a crew run
+        return self.status == SUCCEEDED and self.run_id is None
+
+
+class JobStore():
+    """Durable job records in SQLite; only the newest `max_jobs` finished jobs are kept."""
+
+    COLUMNS = ('id', 'status', 'inputs', 'run_id', 'completed', 'sections', 'result', 'error', 'log', 'created_at', 'updated_at')
+
+    def __init__(self, path: str, max_jobs: int = 500):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_jobs = max_jobs
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                'id TEXT PRIMARY KEY, status TEXT NOT NULL, inputs TEXT NOT NULL, run_id TEXT, '
+                "completed TEXT NOT NULL DEFAULT '[]', sections TEXT, result TEXT, error TEXT, log TEXT, "
+                'created_at REAL NOT NULL, updated_at REAL NOT NULL)'
+            )
+            # Job databases created before per-section results were stored
+            existing = {row[1] for row in self._conn.execute('PRAGMA table_info(jobs)')}
+            if 'sections' not in existing:
+                self._conn.execute('ALTER TABLE jobs ADD COLUMN sections TEXT')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS jobs_updated ON jobs (updated_at)')
+
+    def create(self, job_id: str, inputs: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT INTO jobs (id, status, inputs, created_at, updated_at) VALUES (?, ?, ?, ?, ?)',
+                (job_id, QUEUED, json.dumps(inputs), now, now)
+            )
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        for name in ('completed', 'sections', 'log'):
+            if name in fields and fields[name] is not None:
+                fields[name] = json.dumps(fields[name])
+        fields['updated_at'] = time.time()
+        assignments = ', '.join(f'{name} = ?' for name in fields if name in self.COLUMNS)
+        values = [value for name, value in fields.items() if name in self.COLUMNS]
+        with self._lock, self._conn:
+            self._conn.execute(f'UPDATE jobs SET {assignments} WHERE id = ?', (*values, job_id))
+            if fields.get('status') in FINISHED_STATES:
+                self._prune()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute(
+                f'SELECT {", ".join(self.COLUMNS)} FROM jobs WHERE id = ?', (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        record = dict(zip(self.COLUMNS, row))
+        return Job(
+            record['id'], record['status'], json.loads(record['inputs']),
+            run_id=record['run_id'],
+            completed=json.loads(record['completed'] or '[]'),
+            sections=json.loads(record['sections']) if record['sections'] else {},
+            result=record['result'],
+            error=record['error'],
+            log=json.loads(record['log']) if record['log'] else [],
+            created_at=record['created_at'],
+            updated_at=record['updated_at']
+        )
+
+    def mark_interrupted(self) -> int:
+        """Fail jobs left queued or running by a previous process; returns how many were found."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                'UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE status IN (?, ?)',
+                (INTERRUPTED, 'The server restarted before this plan finished.', time.time(), QUEUED, RUNNING)
+            )
+            return cursor.rowcount
+
+    def _prune(self) -> None:
+        self._conn.execute(
+            'DELETE FROM jobs WHERE status IN (?, ?, ?) AND id NOT IN '
+            '(SELECT id FROM jobs ORDER BY updated_at DESC LIMIT ?)',
+            (*FINISHED_STATES, self.max_jobs)
+        )
+
+
+class JobRunner():
+    """
+    Runs event plans on a bounded worker pool. submit() returns a job id
+    immediately; callers poll get() and logs() until the job has finished.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, store: Optional[JobStore] = None,
+                 crew_factory: Callable[..., EventCrew] = EventCrew):
+        config = Config.get_jobs_config()
+        self.store = store or JobStore(config['path'], config['max_jobs'])
+        self.max_log_lines = config['max_log_lines']
+        self.crew_factory = crew_factory
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or config['max_workers'],
+                                            thread_name_prefix='plan-job')
+        self._logs: Dict[str, AgentLog] = {}
+        self._logs_lock = threading.Lock()
+
+        interrupted = self.store.mark_interrupted()
+        if interrupted:
+            logger.info("Marked %d unfinished jobs from a previous run as interrupted", interrupted)
+        install_log_router()
+
+    def submit(self, inputs: Dict[str, Any]) -> str:
+        """
+        Queue a plan for the given EventCrew keyword arguments and return its job id.
+        Equivalent requests with a stored plan finish immediately without using a worker.
+        """
+        job_id = uuid.uuid4().hex
+        self.store.create(job_id, inputs)
+
+        cached_plan = load_plan(inputs)
+        if cached_plan is not None:
+            self.store.update(job_id, status=SUCCEEDED, completed=list(EventCrew.TASK_NAMES), result=cached_plan,
+                              log=["Served a stored plan for an equivalent event request."])
+            return job_id
+
+        with self._logs_lock:
+            self._logs[job_id] = AgentLog(max_lines=self.max_log_lines)
+        # Warm the search cache while a worker picks the job up and builds the agents
+        start_prefetch(inputs)
+        self._executor.submit(self._run, job_id, inputs)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.store.get(job_id)
+
+    def logs(self, job_id: str) -> List[str]:
+        """Live log lines of a job run by this process, or the stored tail once it has finished."""
+        with self._logs_lock:
+            log = self._logs.get(job_id)
+        if log is not None:
+            return log.snapshot()
+        job = self.store.get(job_id)
+        return job.log if job else []
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job_id: str, inputs: Dict[str, Any]) -> None:
+        # Put the router back if anything replaced sys.stdout since the last job
+        install_log_router()
+        log = self._logs[job_id]
+        token = current_job_log.set(log)
+        completed: List[str] = []
+        sections: Dict[str, str] = {}
+        completed_lock = threading.Lock()
+
+        def on_task_complete(name, output):
+            # Finished sections are stored right away so the UI can show them before the plan is done
+            with completed_lock:
+                completed.append(name)
+                sections[name] = EventCrew._output_text(output)
+                self.store.update(job_id, completed=list(completed), sections=dict(sections))
+
+        try:
+            crew = self.crew_factory(**inputs, on_task_complete=on_task_complete)
+            self.store.update(job_id, status=RUNNING, run_id=crew.run_id)
+            result = crew.run()
+            if not result:
+                raise RuntimeError("No event plan was generated.")
+            log.flush()
+            self.store.update(job_id, status=SUCCEEDED, result=str(result), log=log.snapshot())
+            store_plan(inputs, str(result))
+        except Exception as e:
+            print(f"Error: Event plan job failed - {type(e).__name__}: {str(e)}")
+            log.flush()
+            self.store.update(job_id, status=FAILED, error=str(e) or type(e).__name__, log=log.snapshot())
+        finally:
+            current_job_log.reset(token)
+            # The stored tail replaces the live buffer once the job has finished
+            with self._logs_lock:
+                self._logs.pop(job_id, None)
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import logging
+import threading
+import warnings
+from typing import Any, Dict, List, Optional
+
+import litellm
+from crewai import LLM
+from crewai.utilities.exceptions.context_window_exceeding_exception import LLMContextLengthExceededException
+
+from config import Config
+from metrics import annotate, span
+from tools.cache_store import CacheStore
+from tools.token_budget import estimate_tokens
+
+_cache: Optional[CacheStore] = None
+_cache_lock = threading.Lock()
+
+# crewai silences these per call by swapping sys.stdout and sys.stderr, which is not
+# safe with agents calling the LLM concurrently (see CachedLLM._complete)
+warnings.filterwarnings('ignore', module='litellm')
+
+
+class LLMReplayMissError(RuntimeError):
+    """Raised in replay mode when no recorded response exists for a request."""
+
+
+def get_llm_cache() -> CacheStore:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            config = Config.get_llm_cache_config()
+            _cache = CacheStore(config['path'], table='llm_responses', max_entries=config['max_entries'])
+    return _cache
+
+
+def cache_key(model: str, temperature: Optional[float], messages: List[Dict[str, str]], **params: Any) -> str:
+    """Hash everything that determines a completion: model, sampling settings, messages and tool/response schemas."""
+    payload = {
+        'model': model,
+        'temperature': temperature,
+        'messages': messages,
+        **{name: value for name, value in params.items() if value is not None},
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+class CachedLLM(LLM):
+    """
+    crewai LLM whose completions are stored in a local cache.
+
+    Modes (LLM_CACHE_MODE):
+    - off: always call the provider
+    - read_write: serve identical requests from the cache, store new responses
+    - record: always call the provider and overwrite the stored response
+    - replay: serve only recorded responses and never touch the network
+    """
+
+    # Name of the agent profile this client serves; spans are recorded as '<profile>:<model>'
+    profile: Optional[str] = None
+
+    def call(self, messages: List[Dict[str, str]], callbacks: List[Any] = []) -> str:
+        prompt_chars = sum(len(message.get('content') or '') for message in messages)
+        name = f"{self.profile}:{self.model}" if self.profile else self.model
+        with span('llm', name, prompt_tokens=estimate_tokens(prompt_chars)):
+            response = self._cached_call(messages, callbacks)
+            annotate(completion_tokens=estimate_tokens(len(response or '')))
+            return response
+
+    def _cached_call(self, messages: List[Dict[str, str]], callbacks: List[Any]) -> str:
+        config = Config.get_llm_cache_config()
+        mode = config['mode']
+        if mode == 'off':
+            return self._complete(messages, callbacks)
+
+        key = cache_key(
+            self.model, self.temperature, messages,
+            stop=self.stop, max_tokens=self.max_tokens or self.max_completion_tokens, seed=self.seed,
+            top_p=self.top_p, response_format=self.response_format, tools=self.kwargs.get('tools')
+        )
+        cache = get_llm_cache()
+
+        if mode in ('read_write', 'replay'):
+            # Recorded responses never expire in replay mode
+            max_age = None if mode == 'replay' else config['ttl_seconds']
+            cached = cache.get(key, max_age=max_age)
+            annotate(cache_hit=cached is not None)
+            if cached is not None:
+                return cached.decode('utf-8')
+            if mode == 'replay':
+                raise LLMReplayMissError(
+                    f"No recorded response for this {self.model} request. Record one with LLM_CACHE_MODE=record."
+                )
+
+        response = self._complete(messages, callbacks)
+        if response:
+            cache.set(key, response.encode('utf-8'))
+        return response
+
+    def _complete(self, messages: List[Dict[str, str]], callbacks: List[Any]) -> str:
+        """
+        LLM.call without its suppress_warnings() block. That block replaces the global
+        sys.stdout and sys.stderr for the duration of the call and restores the streams
+        it saw on entry, so two overlapping calls leave stdout on a dead buffer and every
+        agent log written after that is lost.
+        """
+        if callbacks:
+            litellm.callbacks = callbacks
+        params = {
+            'model': self.model,
+            'messages': messages,
+            'timeout': self.timeout,
+            'temperature': self.temperature,
+            'top_p': self.top_p,
+            'n': self.n,
+            'stop': self.stop,
+            'max_tokens': self.max_tokens or self.max_completion_tokens,
+            'presence_penalty': self.presence_penalty,
+            'frequency_penalty': self.frequency_penalty,
+            'logit_bias': self.logit_bias,
+            'response_format': self.response_format,
+            'seed': self.seed,
+            'logprobs': self.logprobs,
+            'top_logprobs': self.top_logprobs,
+            'api_base': self.base_url,
+            'api_version': self.api_version,
+            'api_key': self.api_key,
+            'stream': False,
+            **self.kwargs,
+        }
+        try:
+            response = litellm.completion(**{name: value for name, value in params.items() if value is not None})
+        except Exception as e:
+            if not LLMContextLengthExceededException(str(e))._is_context_limit_error(str(e)):
+                logging.error(f"LiteLLM call failed: {str(e)}")
+            raise
+        return response["choices"][0]["message"]["content"]
+
+
+def default_llm_params() -> Dict[str, Any]:
+    """The environment defaults crewai applies to agents without an llm."""
+    llm_params = {'model': os.environ.get('OPENAI_MODEL_NAME', 'gpt-4o-mini')}
+    api_base = os.environ.get('OPENAI_API_BASE') or os.environ.get('OPENAI_BASE_URL')
+    if api_base:
+        llm_params['base_url'] = api_base
+    api_key = os.environ.get('OPENAI_API_KEY')
+    if api_key:
+        llm_params['api_key'] = api_key
+    return llm_params
+
+
+def create_llm(**params: Any) -> CachedLLM:
+    """Build a cached LLM using the same environment defaults crewai applies to agents without an llm."""
+    return CachedLLM(**{**default_llm_params(), **params})
@@ -0,0 +1,60 @@
+"""
+Per-agent LLM profiles and latency-aware routing.
+
+Each agent gets an LLM client built from its profile in
+Config.get_llm_profiles_config() (model, max tokens, request timeout). Once an
+agent has spent fallback_at of its max_execution_time, its remaining LLM calls
+go to the faster fallback model so the task finishes in time. LLM spans are
+named '<profile>:<model>' so latency is reported per profile and model.
+"""
+import logging
+from typing import Any, Dict, List, Optional
+
+from config import Config
+from llm_cache import CachedLLM, create_llm, default_llm_params
+from metrics import agent_elapsed, annotate
+
+logger = logging.getLogger(__name__)
+
+
+class RoutedLLM(CachedLLM):
+    """CachedLLM of one agent profile that hands calls to a faster model once the agent is running late."""
+
+    def __init__(self, profile: str, fallback: Optional[CachedLLM] = None,
+                 fallback_after: Optional[float] = None, **params: Any):
+        super().__init__(**params)
+        self.profile = profile
+        self.fallback = fallback
+        self.fallback_after = fallback_after
+
+    def call(self, messages: List[Dict[str, str]], callbacks: List[Any] = []) -> str:
+        elapsed = agent_elapsed()
+        if self.fallback is not None and self.fallback_after is not None and elapsed is not None \
+                and elapsed >= self.fallback_after:
+            logger.info("%s agent has run %.0fs, switching from %s to %s", self.profile, elapsed, self.model, self.fallback.model)
+            # crewai sets the stop words on the agent's LLM; the fallback has to honour them too
+            self.fallback.stop = self.stop
+            response = self.fallback.call(messages, callbacks)
+            # Marks the agent's task span as (partly) answered by the fallback model
+            annotate(llm_fallback=self.fallback.model)
+            return response
+        return super().call(messages, callbacks)
+
+
+def create_agent_llm(profile: str, max_execution_time: Optional[float] = None) -> CachedLLM:
+    """LLM client for an agent profile; routes to the fallback model near max_execution_time."""
+    config = Config.get_llm_profiles_config()
+    if not config['enabled'] or profile not in config['profiles']:
+        return create_llm()
+
+    settings = config['profiles'][profile]
+    params = {'model': settings['model'], 'max_tokens': settings['max_tokens'], 'timeout': settings['timeout']}
+
+    fallback = None
+    fallback_after = None
+    if max_execution_time and config['fallback_model'] != settings['model']:
+        fallback = create_llm(**{**params, 'model': config['fallback_model']})
+        fallback.profile = f"{profile}-fallback"
+        fallback_after = settings['fallback_at'] * max_execution_time
+
+    return RoutedLLM(profile, fallback, fallback_after, **{**default_llm_params(), **params})
@@ -0,0 +1,220 @@
+"""
+Lightweight timing spans for agent steps, tool calls, HTTP requests and LLM calls.
+
+Spans are tagged with the current run and agent through context variables, kept
+in a bounded in-memory buffer and aggregated per (kind, name). They can be
+exported as JSON lines or in the Prometheus text exposition format.
+"""
+import json
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Dict, Iterator, List, Optional
+
+from config import Config
+
+current_run_id: ContextVar[Optional[str]] = ContextVar('current_run_id', default=None)
+current_agent: ContextVar[Optional[str]] = ContextVar('current_agent', default=None)
+_current_span: ContextVar[Optional['Span']] = ContextVar('_current_span', default=None)
+_last_step_at: ContextVar[Optional[float]] = ContextVar('_last_step_at', default=None)
+_agent_started_at: ContextVar[Optional[float]] = ContextVar('_agent_started_at', default=None)
+
+# Numeric span attributes that are summed into Prometheus counters
+COUNTED_ATTRIBUTES = ('bytes', 'prompt_tokens', 'completion_tokens')
+
+
+class Span():
+    def __init__(self, kind: str, name: str, attrs: Dict[str, Any]):
+        self.kind = kind
+        self.name = name
+        self.attrs = attrs
+        self.run_id = current_run_id.get()
+        self.agent = current_agent.get()
+        self.started_at = time.time()
+        self.duration_ms = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            'run_id': self.run_id,
+            'agent': self.agent,
+            'kind': self.kind,
+            'name': self.name,
+            'started_at': round(self.started_at, 6),
+            'duration_ms': round(self.duration_ms, 3),
+            **self.attrs,
+        }
+
+
+class MetricsRecorder():
+    """Thread-safe store of finished spans plus running per-(kind, name) aggregates."""
+
+    def __init__(self, max_spans: int = 10000):
+        self._lock = threading.Lock()
+        self._spans = deque(maxlen=max_spans)
+        self._aggregates: Dict[tuple, Dict[str, float]] = {}
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+            aggregate = self._aggregates.setdefault((span.kind, span.name), {
+                'count': 0, 'seconds': 0.0, 'errors': 0, 'cache_hits': 0,
+                **{attr: 0 for attr in COUNTED_ATTRIBUTES},
+            })
+            aggregate['count'] += 1
+            aggregate['seconds'] += span.duration_ms / 1000
+            aggregate['errors'] += 1 if span.attrs.get('error') else 0
+            aggregate['cache_hits'] += 1 if span.attrs.get('cache_hit') else 0
+            for attr in COUNTED_ATTRIBUTES:
+                aggregate[attr] += span.attrs.get(attr) or 0
+
+    def spans(self, run_id: Optional[str] = None) -> List[Span]:
+        with self._lock:
+            return [span for span in self._spans if run_id is None or span.run_id == run_id]
+
+    def breakdown(self, run_id: str) -> List[dict]:
+        """Per-agent, per-(kind, name) totals for one run, slowest first."""
+        rows: Dict[tuple, dict] = {}
+        for span in self.spans(run_id):
+            row = rows.setdefault((span.agent or '-', span.kind, span.name), {
+                'agent': span.agent or '-', 'kind': span.kind, 'name': span.name,
+                'calls': 0, 'total_ms': 0.0, 'cache_hits': 0, 'bytes': 0, 'tokens': 0,
+            })
+            row['calls'] += 1
+            row['total_ms'] += span.duration_ms
+            row['cache_hits'] += 1 if span.attrs.get('cache_hit') else 0
+            row['bytes'] += span.attrs.get('bytes') or 0
+            row['tokens'] += (span.attrs.get('prompt_tokens') or 0) + (span.attrs.get('completion_tokens') or 0)
+        return sorted(rows.values(), key=lambda row: row['total_ms'], reverse=True)
+
+    def to_jsonl(self, run_id: Optional[str] = None) -> str:
+        return ''.join(json.dumps(span.to_dict(), default=str) + '\n' for span in self.spans(run_id))
+
+    def to_prometheus(self) -> str:
+        with self._lock:
+            aggregates = {key: dict(value) for key, value in self._aggregates.items()}
+
+        metrics = [
+            ('event_planner_span_seconds_total', 'counter', 'Total time spent in spans', 'seconds'),
+            ('event_planner_span_calls_total', 'counter', 'Number of finished spans', 'count'),
+            ('event_planner_span_errors_total', 'counter', 'Spans that ended in an error', 'errors'),
+            ('event_planner_cache_hits_total', 'counter', 'Spans served from a cache', 'cache_hits'),
+            ('event_planner_bytes_total', 'counter', 'Response bytes transferred', 'bytes'),
+            ('event_planner_prompt_tokens_total', 'counter', 'Estimated LLM prompt tokens', 'prompt_tokens'),
+            ('event_planner_completion_tokens_total', 'counter', 'Estimated LLM completion tokens', 'completion_tokens'),
+        ]
+        lines = []
+        for metric, metric_type, help_text, field in metrics:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {metric_type}")
+            for (kind, name), aggregate in sorted(aggregates.items()):
+                label_name = name.replace('\\', '\\\\').replace('"', '\\"')
+                lines.append(f'{metric}{{kind="{kind}",name="{label_name}"}} {aggregate[field]:g}')
+        return '\n'.join(lines) + '\n'
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+            self._aggregates.clear()
+
+
+recorder = MetricsRecorder()
+
+
+@contextmanager
+def span(kind: str, name: str, **attrs: Any) -> Iterator[Span]:
+    """Time a block of work; attributes can be added while it runs via annotate()."""
+    current = Span(kind, name, attrs)
+    token = _current_span.set(current)
+    start = time.perf_counter()
+    try:
+        yield current
+    except Exception as e:
+        current.attrs['error'] = type(e).__name__
+        raise
+    finally:
+        current.duration_ms = (time.perf_counter() - start) * 1000
+        _current_span.reset(token)
+        if Config.get_metrics_config()['enabled']:
+            recorder.record(current)
+            export_path = Config.get_metrics_config()['jsonl_path']
+            if export_path:
+                _append_jsonl(export_path, current)
+
+
+def annotate(**attrs: Any) -> None:
+    """Attach attributes such as cache_hit or bytes to the innermost active span."""
+    current = _current_span.get()
+    if current is not None:
+        current.attrs.update(attrs)
+
+
+def traced(kind: str, name: Optional[str] = None):
+    """Decorator that records each call as a span; string results starting with 'Error:' count as errors."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(kind, name or fn.__name__) as current:
+                result = fn(*args, **kwargs)
+                if isinstance(result, str):
+                    current.attrs['output_chars'] = len(result)
+                    if result.startswith('Error:'):
+                        current.attrs['error'] = result[:120]
+                return result
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def run_context(run_id: Optional[str] = None) -> Iterator[str]:
+    """Tag every span recorded inside the block with a run id."""
+    run_id = run_id or uuid.uuid4().hex
+    token = current_run_id.set(run_id)
+    try:
+        yield run_id
+    finally:
+        current_run_id.reset(token)
+
+
+@contextmanager
+def agent_context(agent: str) -> Iterator[None]:
+    token = current_agent.set(agent)
+    step_token = _last_step_at.set(time.perf_counter())
+    started_token = _agent_started_at.set(time.perf_counter())
+    try:
+        yield
+    finally:
+        _agent_started_at.reset(started_token)
+        _last_step_at.reset(step_token)
+        current_agent.reset(token)
+
+
+def agent_elapsed() -> Optional[float]:
+    """Seconds since the current agent's task started, or None outside of an agent task."""
+    started = _agent_started_at.get()
+    return time.perf_counter() - started if started is not None else None
+
+
+def record_step(step_output: Any) -> None:
+    """
+    crewai step_callback recording one span per agent step (an LLM thought plus
+    any tool call), timed from the previous step or the start of the agent's task.
+    """
+    now = time.perf_counter()
+    started = _last_step_at.get() or now
+    _last_step_at.set(now)
+    current = Span('agent_step', current_agent.get() or 'unknown', {'tool': getattr(step_output, 'tool', None)})
+    current.duration_ms = (now - started) * 1000
+    if Config.get_metrics_config()['enabled']:
+        recorder.record(current)
+
+
+_export_lock = threading.Lock()
+
+
+def _append_jsonl(path: str, current: Span) -> None:
+    with _export_lock, open(path, 'a') as f:
+        f.write(json.dumps(current.to_dict(), default=str) + '\n')
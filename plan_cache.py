@@ -0,0 +1,64 @@
+import hashlib
+import json
+import threading
+import zlib
+from typing import Any, Dict, Optional
+
+from config import Config
+from tools.cache_store import CacheStore
+from tools.cities import normalize_city
+
+_cache: Optional[CacheStore] = None
+_cache_lock = threading.Lock()
+
+# Bumped when canonical_inputs changes so plans stored under the old key form are never served
+PLAN_KEY_VERSION = 2
+
+
+def normalize_text(text: str) -> str:
+    """Trim, case-fold and collapse whitespace."""
+    return ' '.join((text or '').casefold().split())
+
+
+def canonical_inputs(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of the EventCrew inputs that decide the plan, in canonical form."""
+    return {
+        'event_description': normalize_text(inputs['event_description']),
+        'location': normalize_city(inputs['location']),
+        # Exact headcount: venue capacities and budget totals only hold for the count they were planned for
+        'people': int(inputs['people_count']),
+        'event_datetime': normalize_text(inputs['event_datetime']),
+        'additional_details': normalize_text(inputs.get('additional_details', '')),
+    }
+
+
+def plan_key(inputs: Dict[str, Any]) -> str:
+    encoded = json.dumps({'version': PLAN_KEY_VERSION, **canonical_inputs(inputs)}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def get_plan_cache() -> Optional[CacheStore]:
+    """Return the process-wide plan cache, or None when caching is disabled."""
+    global _cache
+    config = Config.get_plan_cache_config()
+    if not config['enabled']:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = CacheStore(config['path'], table='plans', max_entries=config['max_entries'])
+    return _cache
+
+
+def load_plan(inputs: Dict[str, Any]) -> Optional[str]:
+    """Return a stored plan for equivalent inputs if one is still fresh."""
+    cache = get_plan_cache()
+    if cache is None:
+        return None
+    value = cache.get(plan_key(inputs), max_age=Config.get_plan_cache_config()['ttl_seconds'])
+    return zlib.decompress(value).decode('utf-8') if value is not None else None
+
+
+def store_plan(inputs: Dict[str, Any], plan: str) -> None:
+    cache = get_plan_cache()
+    if cache is not None:
+        cache.set(plan_key(inputs), zlib.compress(plan.encode('utf-8')))
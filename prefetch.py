@@ -0,0 +1,112 @@
+"""
+Speculative search prefetch.
+
+The searches agents run are predictable from the task prompts: they mostly
+run the example query of their task (task_queries.py) with the event's
+location filled in. As soon as a plan is requested, those queries are sent
+concurrently so their results are in the search cache by the time the agents
+have been built and made their first LLM call. An agent that searches for a
+query still in flight waits for the prefetch instead of sending a duplicate
+request.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+from config import Config
+from task_queries import example_queries
+from tools.search_cache import get_cached_results, get_search_cache, normalize_query
+from tools.venue_catalog import get_venue_catalog
+
+logger = logging.getLogger(__name__)
+
+# Catalogued venues at which the Venue Finder is told to skip the web search
+CATALOG_VENUES_NEEDED = 3
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def prefetch_queries(inputs: Dict[str, Any]) -> List[str]:
+    """Search queries the agents are expected to run for a plan with these EventCrew inputs."""
+    location = str(inputs.get('location') or '').strip()
+    if not location:
+        return []
+    queries = example_queries(location)
+    # The Venue Finder is told to skip the web search when the catalog already has enough venues
+    if _catalog_covers(location, inputs.get('people_count')):
+        queries.pop('venue')
+    return list(queries.values())
+
+
+def _catalog_covers(location: str, people_count: Any) -> bool:
+    try:
+        catalog = get_venue_catalog()
+        if catalog is None or not location:
+            return False
+        venues = catalog.search(location, int(people_count), limit=CATALOG_VENUES_NEEDED,
+                                max_age=Config.get_venue_catalog_config()['max_age'])
+        return len(venues) >= CATALOG_VENUES_NEEDED
+    except Exception:
+        return False
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=Config.get_prefetch_config()['max_workers'],
+                                           thread_name_prefix='prefetch')
+    return _executor
+
+
+def _fetch(query: str, api_key: str) -> None:
+    from tools.search_tools import SearchTools
+
+    try:
+        SearchTools.fetch_results(query, api_key, prefetch=True)
+    except Exception as e:
+        logger.info("Prefetch of %r failed: %s", query, e)
+
+
+def start_prefetch(inputs: Dict[str, Any]) -> List[str]:
+    """
+    Send the expected searches for a plan in the background and return the queries
+    sent. Queries that are cached or already in flight are skipped.
+    """
+    api_key = os.getenv('SERPER_API_KEY')
+    # Results only help the agents if they land in the search cache
+    if not Config.get_prefetch_config()['enabled'] or not api_key or get_search_cache() is None:
+        return []
+
+    sent = []
+    for query in prefetch_queries(inputs):
+        if get_cached_results(query) is not None:
+            continue
+        key = normalize_query(query)
+        with _inflight_lock:
+            if key in _inflight:
+                continue
+            future = _inflight[key] = _get_executor().submit(_fetch, query, api_key)
+        future.add_done_callback(lambda _, key=key: _forget(key))
+        sent.append(query)
+    return sent
+
+
+def _forget(key: str) -> None:
+    with _inflight_lock:
+        _inflight.pop(key, None)
+
+
+def wait_for_prefetch(query: str, timeout: Optional[float] = None) -> bool:
+    """Wait for an in-flight prefetch of this query; True if there was one and it finished."""
+    with _inflight_lock:
+        future = _inflight.get(normalize_query(query))
+    if future is None:
+        return False
+    done, _ = wait([future], timeout=Config.get_prefetch_config()['wait_seconds'] if timeout is None else timeout)
+    return bool(done)
@@ -0,0 +1,52 @@
+import hashlib
+import json
+import threading
+from typing import List, Optional
+
+from config import Config
+from tools.cache_store import CacheStore
+
+_cache: Optional[CacheStore] = None
+_cache_lock = threading.Lock()
+
+
+def get_task_cache() -> Optional[CacheStore]:
+    """Return the process-wide task output cache, or None when memoization is disabled."""
+    global _cache
+    config = Config.get_task_cache_config()
+    if not config['enabled']:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = CacheStore(config['path'], table='task_outputs', max_entries=config['max_entries'])
+    return _cache
+
+
+def task_key(name: str, description: str, expected_output: str, model: str, upstream: List[str]) -> str:
+    """
+    Hash everything a task's output depends on. The rendered description holds exactly
+    the form inputs the task uses, so e.g. the theme task is unaffected by the location.
+    """
+    payload = {
+        'task': name,
+        'description': description,
+        'expected_output': expected_output,
+        'model': model,
+        'upstream': upstream,
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def load_output(key: str) -> Optional[str]:
+    cache = get_task_cache()
+    if cache is None:
+        return None
+    value = cache.get(key, max_age=Config.get_task_cache_config()['ttl_seconds'])
+    return value.decode('utf-8') if value is not None else None
+
+
+def store_output(key: str, output: str) -> None:
+    cache = get_task_cache()
+    if cache is not None and output:
+        cache.set(key, output.encode('utf-8'))
@@ -0,0 +1,27 @@
+"""
+Example search queries shown to the agents in their task prompts.
+
+Agents mostly run these queries as given, so prefetch.py sends the same ones
+ahead of the agents. Both event_tasks.py and prefetch.py format them from here,
+which keeps the prompts and the prefetched cache keys identical. The module has
+no crewai dependency so it stays cheap to import.
+"""
+from typing import Dict
+
+EXAMPLE_QUERIES = {
+    'theme': 'creative office party themes 2025',
+    'agenda': 'corporate event agenda template',
+    'venue': 'corporate event venues {location}',
+    'travel': 'transportation options {location}',
+    'budget': 'corporate event costs {location} per person',
+}
+
+
+def example_query(task: str, **values: str) -> str:
+    """The example query of a task with the event details filled in."""
+    return EXAMPLE_QUERIES[task].format(**values)
+
+
+def example_queries(location: str) -> Dict[str, str]:
+    """Example query of every task for an event in the given location."""
+    return {task: example_query(task, location=location) for task in EXAMPLE_QUERIES}
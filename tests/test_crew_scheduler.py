@@ -0,0 +1,153 @@
+import contextvars
+import threading
+import time
+
+import pytest
+
+from crew_scheduler import DagScheduler
+
+request_id = contextvars.ContextVar('request_id', default=None)
+
+
+def test_nodes_run_after_their_dependencies_with_only_their_outputs():
+    finished = []
+    seen = {}
+
+    def node(name):
+        def run(upstream):
+            seen[name] = dict(upstream)
+            finished.append(name)
+            return f"{name} output"
+        return run
+
+    scheduler = DagScheduler(max_workers=4)
+    scheduler.add('budget', node('budget'), depends_on=('venue',))
+    scheduler.add('venue', node('venue'))
+    scheduler.add('theme', node('theme'))
+    scheduler.add('agenda', node('agenda'), depends_on=('theme',))
+
+    results = scheduler.run()
+
+    assert results == {name: f"{name} output" for name in ('theme', 'agenda', 'venue', 'budget')}
+    assert finished.index('theme') < finished.index('agenda')
+    assert finished.index('venue') < finished.index('budget')
+    assert seen['agenda'] == {'theme': 'theme output'}
+    assert seen['budget'] == {'venue': 'venue output'}
+    assert seen['theme'] == {}
+
+
+def test_order_is_topological():
+    scheduler = DagScheduler()
+    scheduler.add('c', lambda _: None, depends_on=('a', 'b'))
+    scheduler.add('b', lambda _: None, depends_on=('a',))
+    scheduler.add('a', lambda _: None)
+
+    assert scheduler.order() == ['a', 'b', 'c']
+
+
+def test_independent_nodes_run_concurrently():
+    both_running = threading.Barrier(2)
+
+    def node(_):
+        # Only returns if the other node is running at the same time
+        both_running.wait(2)
+        return True
+
+    scheduler = DagScheduler(max_workers=2)
+    scheduler.add('venue', node)
+    scheduler.add('travel', node)
+
+    assert scheduler.run() == {'venue': True, 'travel': True}
+
+
+def test_dependent_starts_as_soon_as_its_dependency_finishes():
+    # agenda only waits for theme, not for the slow venue node
+    release_venue = threading.Event()
+    agenda_ran = threading.Event()
+
+    def agenda(_):
+        agenda_ran.set()
+
+    def venue(_):
+        release_venue.wait(2)
+
+    scheduler = DagScheduler(max_workers=3)
+    scheduler.add('theme', lambda _: None)
+    scheduler.add('agenda', agenda, depends_on=('theme',))
+    scheduler.add('venue', venue)
+
+    runner = threading.Thread(target=scheduler.run)
+    runner.start()
+    assert agenda_ran.wait(1)
+    release_venue.set()
+    runner.join(2)
+
+
+def test_dependency_cycle_is_rejected():
+    scheduler = DagScheduler()
+    scheduler.add('a', lambda _: None, depends_on=('c',))
+    scheduler.add('b', lambda _: None, depends_on=('a',))
+    scheduler.add('c', lambda _: None, depends_on=('b',))
+    scheduler.add('d', lambda _: None)
+
+    with pytest.raises(ValueError, match='cycle.*a, b, c'):
+        scheduler.run()
+
+
+def test_unknown_dependency_is_rejected():
+    scheduler = DagScheduler()
+    scheduler.add('budget', lambda _: None, depends_on=('venue',))
+
+    with pytest.raises(ValueError, match="unknown node 'venue'"):
+        scheduler.order()
+
+
+def test_duplicate_node_is_rejected():
+    scheduler = DagScheduler()
+    scheduler.add('theme', lambda _: None)
+
+    with pytest.raises(ValueError, match='Duplicate'):
+        scheduler.add('theme', lambda _: None)
+
+
+def test_upstream_failure_propagates_and_skips_dependents():
+    ran = []
+    travel_running = threading.Event()
+    travel_finished = threading.Event()
+
+    def venue(_):
+        travel_running.wait(2)
+        raise RuntimeError('venue search failed')
+
+    def travel(_):
+        travel_running.set()
+        time.sleep(0.1)
+        travel_finished.set()
+
+    scheduler = DagScheduler(max_workers=2)
+    scheduler.add('venue', venue)
+    scheduler.add('budget', lambda _: ran.append('budget'), depends_on=('venue',))
+    scheduler.add('travel', travel)
+
+    with pytest.raises(RuntimeError, match='venue search failed'):
+        scheduler.run()
+
+    assert ran == []
+    # Nodes already running are allowed to finish before run() raises
+    assert travel_finished.is_set()
+
+
+def test_nodes_run_in_the_callers_context():
+    token = request_id.set('run-1')
+    try:
+        scheduler = DagScheduler(max_workers=2)
+        scheduler.add('theme', lambda _: request_id.get())
+        scheduler.add('agenda', lambda _: request_id.get(), depends_on=('theme',))
+
+        assert scheduler.run() == {'theme': 'run-1', 'agenda': 'run-1'}
+    finally:
+        request_id.reset(token)
+
+
+def test_empty_graph():
+    assert DagScheduler().run() == {}
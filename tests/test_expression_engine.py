@@ -0,0 +1,100 @@
+import time
+
+import pytest
+
+from tools.expression_engine import ExpressionError, evaluate, format_result, normalize
+
+
+@pytest.mark.parametrize('expression, expected', [
+    ('2500 + 1000', 3500),
+    ('250 * 100 - 500', 24500),
+    ('7 / 2', 3.5),
+    ('7 // 2', 3),
+    ('10 % 3', 1),
+    ('2 ** 10', 1024),
+    ('2 ^ 10', 1024),
+    ('-(3 + 4) * 2', -14),
+    ('sqrt(16) + abs(-2)', 6.0),
+    ('round(2.345, 2)', 2.35),
+    ('max(1,250)', 250),
+    ('sum([1, 2, 3])', 6),
+    ('max((4, 9))', 9),
+    ('ceil(pi)', 4),
+])
+def test_whitelisted_arithmetic(expression, expected):
+    assert evaluate(expression) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('expression, expected', [
+    ('18% of 50000', 9000),
+    ('250 * 18%', 45),
+    ('100 + 20%', 120),
+    ('100 - 20%', 80),
+    ('(1500 + 500) * 5%', 100),
+])
+def test_percent_shorthand(expression, expected):
+    assert evaluate(expression) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('expression, expected', [
+    ('25,000 * 12', 300000),
+    ('1,50,000 + 25,000', 175000),
+    ('18% of 1,00,000', 18000),
+    ('1,234.5 * 2', 2469),
+    ('(25,000)', 25000),
+])
+def test_digit_grouping_commas(expression, expected):
+    assert evaluate(expression) == pytest.approx(expected)
+
+
+def test_commas_inside_calls_stay_argument_separators():
+    assert normalize('max(1,250)') == 'max(1,250)'
+    assert normalize('1,250 + max(1,250)') == '1250 + max(1,250)'
+
+
+@pytest.mark.parametrize('expression', [
+    '1,2',
+    '[1, 2]',
+    '(1, 2) * 3',
+    'sum([(1, 2)])',
+    '__import__("os")',
+    'open("x")',
+    '(1).real',
+    'x + 1',
+    'True + 1',
+    '"a" * 3',
+    '1 if 1 else 2',
+    'lambda: 1',
+    '[n for n in (1, 2)]',
+    'max(1, key=abs)',
+    '1 < 2',
+    '2 ** 1001',
+    'pow(2, 5000)',
+    '((10 ** 1000) ** 1000) ** 1000',
+    '10 ** 1000 * 10 ** 1000',
+    '1 + ' * 200 + '1',
+])
+def test_rejected_expressions(expression):
+    with pytest.raises(ExpressionError):
+        evaluate(expression)
+
+
+def test_huge_powers_are_rejected_quickly():
+    started = time.perf_counter()
+    with pytest.raises(ExpressionError):
+        evaluate('((10 ** 1000) ** 1000) ** 1000')
+    assert time.perf_counter() - started < 1
+
+
+def test_blank_expression():
+    with pytest.raises(ExpressionError):
+        evaluate('   ')
+
+
+@pytest.mark.parametrize('result, expected', [
+    (300000, '300000'),
+    (45.0, '45'),
+    (2.3456, '2.35'),
+])
+def test_format_result(result, expected):
+    assert format_result(result) == expected
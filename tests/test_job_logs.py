@@ -0,0 +1,41 @@
+import sys
+import threading
+
+import litellm
+
+from agent_log import AgentLog
+from jobs import LogRouter, current_job_log, install_log_router
+from llm_cache import create_llm
+
+
+def test_overlapping_llm_calls_keep_each_job_log(monkeypatch):
+    monkeypatch.setenv('LLM_CACHE_MODE', 'off')
+    monkeypatch.setenv('OPENAI_API_KEY', 'test')
+    both_calling = threading.Barrier(2)
+
+    def completion(**params):
+        # Both calls are in flight at once, as with agents running concurrently
+        both_calling.wait(5)
+        print("Give Feedback / Get Help: https://github.com/BerriAI/litellm/issues/new")
+        return {'choices': [{'message': {'content': 'answer'}}]}
+
+    monkeypatch.setattr(litellm, 'completion', completion)
+    monkeypatch.setattr(sys, 'stdout', sys.stdout)
+    install_log_router()
+    logs = [AgentLog(), AgentLog()]
+
+    def job(log, name):
+        current_job_log.set(log)
+        print(f"{name} started")
+        print(create_llm().call([{'role': 'user', 'content': name}]))
+        print(f"{name} finished")
+
+    threads = [threading.Thread(target=job, args=(log, f"job {n}")) for n, log in enumerate(logs)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert isinstance(sys.stdout, LogRouter)
+    assert logs[0].snapshot() == ['job 0 started', 'answer', 'job 0 finished']
+    assert logs[1].snapshot() == ['job 1 started', 'answer', 'job 1 finished']
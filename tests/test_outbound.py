@@ -0,0 +1,237 @@
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from tools import outbound
+from tools.outbound import HEDGE_WORKERS, CircuitBreaker, TokenBucket, hedged
+
+
+class FakeResponse():
+    def __init__(self, name):
+        self.name = name
+        self.closed = threading.Event()
+
+    def close(self):
+        self.closed.set()
+
+
+class ScriptedCall():
+    """Callable for hedged(): the n-th call waits for its gate (if any) and returns response n."""
+
+    def __init__(self, *gates):
+        self.gates = gates
+        self.responses = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            n = next(self._counter)
+            response = FakeResponse(n)
+            self.responses.append(response)
+        if n < len(self.gates) and self.gates[n] is not None:
+            self.gates[n].wait(5)
+        return response
+
+
+@pytest.fixture
+def fake_time(clock, monkeypatch):
+    monkeypatch.setattr(outbound, 'time', clock)
+    return clock
+
+
+def test_token_bucket_allows_a_burst_then_refills_at_rate(fake_time):
+    bucket = TokenBucket(rate=2, capacity=2)
+
+    assert bucket.acquire(timeout=0)
+    assert bucket.acquire(timeout=0)
+    assert not bucket.acquire(timeout=0)
+
+    fake_time.advance(0.25)
+    assert not bucket.acquire(timeout=0)
+    fake_time.advance(0.25)
+    assert bucket.acquire(timeout=0)
+
+    # Tokens never pile up beyond the burst size
+    fake_time.advance(60)
+    assert [bucket.acquire(timeout=0) for _ in range(3)] == [True, True, False]
+
+
+def test_token_bucket_acquire_waits_for_the_next_token(fake_time):
+    bucket = TokenBucket(rate=4, capacity=1)
+    assert bucket.acquire()
+
+    started = fake_time.now
+    assert bucket.acquire()
+    assert fake_time.now - started == pytest.approx(0.25)
+
+
+def test_token_bucket_acquire_gives_up_at_the_timeout(fake_time):
+    bucket = TokenBucket(rate=1, capacity=1)
+    assert bucket.acquire()
+
+    started = fake_time.now
+    assert not bucket.acquire(timeout=0.4)
+    assert fake_time.now - started == pytest.approx(0.4)
+
+
+def test_token_bucket_pause_holds_back_callers_with_tokens_left(fake_time):
+    bucket = TokenBucket(rate=10, capacity=5)
+    bucket.pause(3)
+
+    assert not bucket.acquire(timeout=0)
+    fake_time.advance(2.9)
+    assert not bucket.acquire(timeout=0)
+    fake_time.advance(0.1)
+    assert bucket.acquire(timeout=0)
+
+
+def test_token_bucket_pause_is_not_shortened_by_a_later_shorter_pause(fake_time):
+    bucket = TokenBucket(rate=10, capacity=5)
+    bucket.pause(3)
+    bucket.pause(1)
+
+    started = fake_time.now
+    assert bucket.acquire()
+    assert fake_time.now - started == pytest.approx(3)
+
+
+def test_breaker_opens_after_consecutive_failures(fake_time):
+    breaker = CircuitBreaker(failures=2, reset_after=10)
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+    assert breaker.retry_in() == pytest.approx(10)
+
+
+def test_breaker_success_resets_the_failure_count(fake_time):
+    breaker = CircuitBreaker(failures=2, reset_after=10)
+
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.allow()
+
+
+def test_breaker_half_open_lets_one_trial_through_and_closes_on_success(fake_time):
+    breaker = CircuitBreaker(failures=1, reset_after=10)
+    breaker.record_failure()
+
+    fake_time.advance(10)
+    assert breaker.allow()
+    # Only one trial call while half-open
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.allow()
+    assert breaker.allow()
+    assert breaker.retry_in() == 0
+
+
+def test_breaker_half_open_trial_failure_reopens(fake_time):
+    breaker = CircuitBreaker(failures=3, reset_after=10)
+    for _ in range(3):
+        breaker.record_failure()
+
+    fake_time.advance(10)
+    assert breaker.allow()
+    breaker.record_failure()
+
+    assert not breaker.allow()
+    assert breaker.retry_in() == pytest.approx(10)
+    fake_time.advance(10)
+    assert breaker.allow()
+
+
+def test_hedge_not_sent_when_primary_answers_in_time():
+    call = ScriptedCall()
+
+    response = hedged(call, hedge_after=1)
+
+    assert response.name == 0
+    assert len(call.responses) == 1
+    assert not response.closed.is_set()
+
+
+def test_hedge_wins_and_late_primary_response_is_closed():
+    primary_gate = threading.Event()
+    call = ScriptedCall(primary_gate)
+
+    response = hedged(call, hedge_after=0.05)
+    assert response.name == 1
+
+    primary_gate.set()
+    primary = call.responses[0]
+    assert primary.closed.wait(2)
+    assert not response.closed.is_set()
+
+
+def test_primary_wins_and_late_hedge_response_is_closed():
+    primary_gate = threading.Event()
+    hedge_gate = threading.Event()
+    call = ScriptedCall(primary_gate, hedge_gate)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        result = executor.submit(hedged, call, 0.05)
+        while len(call.responses) < 2:
+            time.sleep(0.01)
+        primary_gate.set()
+        response = result.result(timeout=2)
+
+    assert response.name == 0
+    hedge_gate.set()
+    assert call.responses[1].closed.wait(2)
+    assert not response.closed.is_set()
+
+
+def test_hedge_skipped_when_can_hedge_refuses():
+    primary_gate = threading.Event()
+    call = ScriptedCall(primary_gate)
+    threading.Timer(0.2, primary_gate.set).start()
+
+    response = hedged(call, hedge_after=0.05, can_hedge=lambda: False)
+
+    assert response.name == 0
+    assert len(call.responses) == 1
+
+
+def test_failed_primary_falls_back_to_the_hedge():
+    primary_gate = threading.Event()
+    calls = ScriptedCall(primary_gate)
+
+    def call():
+        response = calls()
+        if response.name == 0:
+            raise requests.ConnectionError("dropped")
+        return response
+
+    threading.Timer(0.2, primary_gate.set).start()
+    assert hedged(call, hedge_after=0.05).name == 1
+
+
+def test_primaries_are_not_queued_behind_the_hedge_pool():
+    # More concurrent slow searches than hedge workers: each primary must still be
+    # sent right away instead of waiting for a pool slot
+    concurrency = HEDGE_WORKERS * 2
+    release = threading.Event()
+    started = threading.Semaphore(0)
+
+    def call():
+        started.release()
+        release.wait(5)
+        return FakeResponse('slow')
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(hedged, call, 0.05, lambda: False) for _ in range(concurrency)]
+        sent = sum(started.acquire(timeout=2) for _ in range(concurrency))
+        release.set()
+        for future in futures:
+            future.result(timeout=5)
+
+    assert sent == concurrency
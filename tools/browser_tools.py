@@ -1,23 +1,132 @@
 from langchain.tools import tool
+from metrics import annotate, span, traced
 from pydantic import BaseModel, Field
+import contextvars
+import logging
 import requests
-from bs4 import BeautifulSoup
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List
 from urllib.parse import urljoin, urlparse
-from bs4.element import Tag
+from config import Config
+from tools.content_extractor import extract
+from tools.http_client import get_session
+from tools.outbound import CircuitOpenError, scrape_request
+from tools.page_cache import load_page, revalidated, store_page
+from tools.token_budget import budgeted
+from tools.venue_catalog import catalog_page
+
+# urllib3 decodes brotli transparently when a brotli package is installed
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+logger = logging.getLogger(__name__)
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+
+def read_limited(response, max_bytes: int) -> bytes:
+    """Read a streamed response body, stopping once max_bytes of decoded content have arrived."""
+    chunks = []
+    received = 0
+    # Recorded separately from the request span, which closes before the body is read
+    with span('http_body', urlparse(response.url or '').netloc):
+        for chunk in response.iter_content(chunk_size=16384):
+            chunks.append(chunk)
+            received += len(chunk)
+            if received >= max_bytes:
+                break
+        annotate(bytes=received)
+    return b''.join(chunks)[:max_bytes]
+
+def _summarize_concurrently(urls: List[str], per_host_limit: int, deadline: float) -> Dict[str, str]:
+    """Scrape URLs on worker threads, at most per_host_limit at a time per host, within a global deadline."""
+    host_limits = {}
+    for url in urls:
+        host = urlparse(url).netloc.lower()
+        if host not in host_limits:
+            host_limits[host] = threading.Semaphore(per_host_limit)
+
+    def fetch(url):
+        with host_limits[urlparse(url).netloc.lower()]:
+            return BrowserTools.summarize_website(url)
+
+    executor = ThreadPoolExecutor(max_workers=len(urls), thread_name_prefix='scrape')
+    try:
+        # Carry context variables (run id, agent, job log) into the worker threads
+        futures = {url: executor.submit(contextvars.copy_context().run, fetch, url) for url in urls}
+        wait(futures.values(), timeout=deadline)
+    finally:
+        # Scrapes still running are abandoned rather than waited for; they finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    results = {}
+    for url, future in futures.items():
+        if not future.done() or future.cancelled():
+            results[url] = f"Error: Scraping {url} did not finish within the {deadline:g}s batch deadline."
+        elif future.exception() is not None:
+            results[url] = f"Error: Unable to scrape website {url} - {future.exception()}"
+        else:
+            results[url] = future.result()
+    return results
 
 class BrowserInput(BaseModel):
     website_url: str = Field(description="Complete website URL to scrape and summarize (must include http:// or https://)")
 
+class BatchBrowserInput(BaseModel):
+    website_urls: List[str] = Field(description="List of complete website URLs to scrape and summarize together (each must include http:// or https://)")
+
 class BrowserTools():
     @tool("scrape_and_summarize_website", args_schema=BrowserInput, return_direct=False)
     @staticmethod
+    @traced('tool')
+    @budgeted
     def scrape_and_summarize_website(website_url: str) -> str:
         """Scrape a website and return a summary of its content. Useful for getting detailed information from specific URLs."""
+        return BrowserTools.summarize_website(website_url)
+    
+    @tool("scrape_many_websites", args_schema=BatchBrowserInput, return_direct=False)
+    @staticmethod
+    @traced('tool')
+    @budgeted
+    def scrape_many_websites(website_urls: List[str]) -> str:
+        """Scrape several websites concurrently and return all their summaries in one response. Prefer this over repeated single scrapes when comparing multiple venues."""
+        
+        if isinstance(website_urls, str):
+            website_urls = [website_urls]
+        if not website_urls or not isinstance(website_urls, list):
+            return "Error: Please provide a list of website URLs."
         
-        # Debug logging
-        print(f"DEBUG: BrowserTools received URL type: {type(website_url)}")
-        print(f"DEBUG: BrowserTools received URL value: {repr(website_url)}")
+        # Drop blanks and duplicates while keeping the agent's order
+        urls = []
+        for website_url in website_urls:
+            if not isinstance(website_url, str) or not website_url.strip():
+                continue
+            url = website_url.strip()
+            if not url.startswith(('http://', 'https://')):
+                url = 'https://' + url
+            if url not in urls:
+                urls.append(url)
+        if not urls:
+            return "Error: Please provide at least one valid website URL."
+        
+        scraper_config = Config.get_scraper_config()
+        skipped = urls[scraper_config['batch_max_urls']:]
+        urls = urls[:scraper_config['batch_max_urls']]
+        
+        results = _summarize_concurrently(urls, scraper_config['per_host_concurrency'], scraper_config['batch_deadline'])
+        
+        sections = [results[url] for url in urls]
+        if skipped:
+            sections.append(f"Note: Skipped {len(skipped)} URLs beyond the batch limit of {len(urls)}: {', '.join(skipped)}")
+        return "\n\n=====\n\n".join(sections)
+    
+    @staticmethod
+    def summarize_website(website_url: str) -> str:
+        """Scrape a single website and build its summary."""
         
         # Handle empty or invalid input
         if not website_url or not isinstance(website_url, str) or not website_url.strip():
@@ -38,60 +147,61 @@ class BrowserTools():
         except Exception:
             return "Error: Invalid URL format."
         
+        # Serve recently scraped pages straight from the page cache
+        cached_page = load_page(url)
+        if cached_page and cached_page.is_fresh:
+            annotate(cache_hit=True)
+            return cached_page.summary
+        
+        scraper_config = Config.get_scraper_config()
+        
         try:
             # Set up headers to mimic a real browser
             headers = {
                 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+                'Accept': 'text/html,application/xhtml+xml;q=0.9,*/*;q=0.8',
                 'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate',
+                'Accept-Encoding': ACCEPT_ENCODING,
                 'Connection': 'keep-alive',
                 'Upgrade-Insecure-Requests': '1'
             }
-            
-            # Make the request
-            response = requests.get(url, headers=headers, timeout=10, allow_redirects=True)
-            response.raise_for_status()
-            
-            # Parse the HTML content
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
-            
-            # Extract title
-            title = soup.find('title')
-            title_text = title.get_text().strip() if title else "No title found"
-            
-            # Extract meta description
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            description = str(meta_desc.get('content', '')).strip() if isinstance(meta_desc, Tag) else ""
-            
-            # Extract main content
-            # Try to find main content areas
-            content_areas = []
-            
-            # Look for common content containers
-            for selector in ['main', 'article', '.content', '#content', '.main-content', '.post-content']:
-                elements = soup.select(selector)
-                for element in elements:
-                    content_areas.append(element.get_text().strip())
-            
-            # If no specific content areas found, get all paragraphs and headings
-            if not content_areas:
-                paragraphs = soup.find_all(['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-                content_areas = [p.get_text().strip() for p in paragraphs if p.get_text().strip()]
-            
-            # Clean and combine content
-            content_text = ' '.join(content_areas)
-            
-            # Clean up whitespace and remove empty lines
-            content_text = re.sub(r'\s+', ' ', content_text).strip()
+            if cached_page:
+                headers.update(cached_page.conditional_headers())
+            
+            # Stream the body so large pages and non-HTML files are never fully downloaded
+            # Retried on connection errors and 5xx; skipped while the domain's circuit breaker is open
+            response = scrape_request(url, lambda: get_session().get(url, headers=headers, timeout=scraper_config['timeout'], allow_redirects=True, stream=True))
+            try:
+                # Unchanged since the last scrape: reuse the stored summary and skip parsing
+                if cached_page and response.status_code == 304:
+                    annotate(cache_hit=True, revalidated=True)
+                    return revalidated(cached_page)
+                response.raise_for_status()
+                
+                content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+                if content_type and content_type not in HTML_CONTENT_TYPES:
+                    return f"Error: {url} is not a web page (content type {content_type}). Please provide an HTML page URL."
+                
+                html = read_limited(response, scraper_config['max_bytes'])
+            finally:
+                response.close()
+            
+            # Single-pass extraction of title, description and main content
+            page = extract(html)
+            title_text = page.title
+            description = page.description
+            content_text = page.text
+            
+            # Remember venue pages so later plans can skip the web for this city
+            try:
+                catalog_page(url, title_text, description, content_text)
+            except Exception as e:
+                logger.warning("Could not add %s to the venue catalog: %s", url, e)
             
             # Limit content length for summary
-            if len(content_text) > 2000:
-                content_text = content_text[:2000] + "..."
+            max_chars = scraper_config['max_chars']
+            if len(content_text) > max_chars:
+                content_text = content_text[:max_chars] + "..."
             
             # Extract any contact information or important links
             contact_info = []
@@ -123,8 +233,12 @@ class BrowserTools():
             if contact_info:
                 summary_parts.extend(contact_info)
             
-            return "\n\n".join(summary_parts)
+            summary = "\n\n".join(summary_parts)
+            store_page(url, summary, response.headers)
+            return summary
             
+        except CircuitOpenError as e:
+            return f"Error: Skipped {url} because {str(e)}. Please use a different website."
         except requests.exceptions.Timeout:
             return f"Error: Request timeout while accessing {url}. The website may be slow or unresponsive."
         except requests.exceptions.ConnectionError:
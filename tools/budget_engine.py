@@ -0,0 +1,98 @@
+from typing import List, Sequence
+
+import numpy as np
+
+# Line items the Budget Analyst prices; the miscellaneous buffer is applied on top as a percentage
+LINE_ITEMS = ['venue', 'catering', 'av', 'decor', 'photography', 'stationery', 'entertainment']
+
+LINE_ITEM_LABELS = {
+    'venue': 'Venue rental',
+    'catering': 'Catering',
+    'av': 'Audio/Visual equipment',
+    'decor': 'Decorations & theme setup',
+    'photography': 'Photography/videography',
+    'stationery': 'Stationery & materials',
+    'entertainment': 'Entertainment/speakers',
+}
+
+
+def format_inr(amount: float) -> str:
+    """Format an amount with Indian digit grouping, e.g. 1250000 -> ₹12,50,000."""
+    rupees = int(round(float(amount)))
+    sign = '-' if rupees < 0 else ''
+    digits = str(abs(rupees))
+    if len(digits) > 3:
+        head, tail = digits[:-3], digits[-3:]
+        groups = []
+        while len(head) > 2:
+            groups.insert(0, head[-2:])
+            head = head[:-2]
+        if head:
+            groups.insert(0, head)
+        digits = ','.join(groups + [tail])
+    return f"{sign}₹{digits}"
+
+
+class BudgetResult():
+    """
+    Costs for every combination of price scenario and attendee count.
+    Arrays are indexed [scenario, attendee_count] and item_costs adds a trailing line item axis.
+    """
+
+    def __init__(self, items: List[str], attendee_counts: np.ndarray, price_multipliers: np.ndarray,
+                 item_costs: np.ndarray, buffer_percent: float):
+        self.items = items
+        self.attendee_counts = attendee_counts
+        self.price_multipliers = price_multipliers
+        self.item_costs = item_costs
+        self.buffer_percent = buffer_percent
+        self.subtotal = item_costs.sum(axis=-1)
+        self.buffer = self.subtotal * (buffer_percent / 100.0)
+        self.total = self.subtotal + self.buffer
+        self.per_person = self.total / attendee_counts[np.newaxis, :]
+
+    def to_markdown(self) -> str:
+        sections = []
+        for s, multiplier in enumerate(self.price_multipliers):
+            header = ['Line item'] + [f"{int(count)} attendees" for count in self.attendee_counts]
+            rows = [header, ['---'] * len(header)]
+            for i, item in enumerate(self.items):
+                rows.append([LINE_ITEM_LABELS.get(item, item)] + [format_inr(v) for v in self.item_costs[s, :, i]])
+            rows.append(['Subtotal'] + [format_inr(v) for v in self.subtotal[s]])
+            rows.append([f"Miscellaneous buffer ({self.buffer_percent:g}%)"] + [format_inr(v) for v in self.buffer[s]])
+            rows.append(['**Total**'] + [f"**{format_inr(v)}**" for v in self.total[s]])
+            rows.append(['Cost per person'] + [format_inr(v) for v in self.per_person[s]])
+
+            title = "Base prices" if multiplier == 1 else f"Prices x{multiplier:g}"
+            table = '\n'.join('| ' + ' | '.join(row) + ' |' for row in rows)
+            sections.append(f"#### {title}\n{table}")
+        return '\n\n'.join(sections)
+
+
+def compute_budget(items: Sequence[str], fixed_costs: Sequence[float], per_person_costs: Sequence[float],
+                   attendee_counts: Sequence[int], price_multipliers: Sequence[float] = (1.0,),
+                   buffer_percent: float = 10.0) -> BudgetResult:
+    """
+    Compute line item costs, totals and per-person costs for all scenarios at once.
+    Each line item costs fixed + per_person * attendees, scaled by the scenario's price multiplier.
+    """
+    if not items:
+        raise ValueError("At least one line item is required.")
+    if not (len(items) == len(fixed_costs) == len(per_person_costs)):
+        raise ValueError("Each line item needs a fixed cost and a per-person cost.")
+
+    fixed = np.asarray(fixed_costs, dtype=float)
+    per_person = np.asarray(per_person_costs, dtype=float)
+    attendees = np.asarray(attendee_counts, dtype=float)
+    multipliers = np.asarray(price_multipliers, dtype=float)
+
+    if attendees.size == 0 or np.any(attendees <= 0):
+        raise ValueError("Attendee counts must be positive.")
+    if multipliers.size == 0 or np.any(multipliers <= 0):
+        raise ValueError("Price multipliers must be positive.")
+    if np.any(fixed < 0) or np.any(per_person < 0):
+        raise ValueError("Costs cannot be negative.")
+
+    # Broadcast to [scenario, attendee_count, line_item]
+    item_costs = multipliers[:, None, None] * (fixed[None, None, :] + per_person[None, None, :] * attendees[None, :, None])
+    return BudgetResult(list(items), attendees, multipliers, item_costs, buffer_percent)
@@ -0,0 +1,51 @@
+from langchain.tools import tool
+from metrics import traced
+from pydantic import BaseModel, Field, ValidationError
+from typing import List
+from tools.budget_engine import LINE_ITEMS, compute_budget
+
+class BudgetLineItem(BaseModel):
+    item: str = Field(description=f"Line item name, one of: {', '.join(LINE_ITEMS)}")
+    fixed_cost: float = Field(default=0, description="Flat cost in INR regardless of headcount (e.g. venue hire, AV package)")
+    per_person_cost: float = Field(default=0, description="Cost in INR per attendee (e.g. catering plate rate)")
+
+class BudgetInput(BaseModel):
+    line_items: List[BudgetLineItem] = Field(description="Rates for each budget line item")
+    attendee_counts: List[int] = Field(description="One or more attendee counts to estimate for, e.g. [50] or [40, 50, 60]")
+    price_multipliers: List[float] = Field(default=[1.0], description="Optional price scenarios applied to all rates, e.g. [0.9, 1.0, 1.2]")
+    buffer_percent: float = Field(default=10, description="Miscellaneous buffer as a percentage of the subtotal (10-15 recommended)")
+
+class BudgetTools():
+    @tool("estimate_budget", args_schema=BudgetInput, return_direct=False)
+    @staticmethod
+    @traced('tool')
+    def estimate_budget(line_items: List[BudgetLineItem], attendee_counts: List[int],
+                        price_multipliers: List[float] = [1.0], buffer_percent: float = 10) -> str:
+        """Compute an itemized INR event budget with subtotal, buffer, total and cost per person from line item rates. Supports several attendee counts and price scenarios in one call."""
+
+        if not line_items:
+            return "Error: Please provide at least one budget line item."
+        if isinstance(attendee_counts, int):
+            attendee_counts = [attendee_counts]
+
+        try:
+            items, fixed_costs, per_person_costs = [], [], []
+            for line_item in line_items:
+                # Tool input may arrive as plain dicts rather than parsed models
+                if isinstance(line_item, dict):
+                    line_item = BudgetLineItem(**line_item)
+                items.append(line_item.item.strip().lower())
+                fixed_costs.append(line_item.fixed_cost)
+                per_person_costs.append(line_item.per_person_cost)
+
+            result = compute_budget(items, fixed_costs, per_person_costs, attendee_counts,
+                                    price_multipliers or [1.0], buffer_percent)
+        except ValidationError as e:
+            problems = '; '.join(f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors())
+            return f"Error: Invalid budget line item - {problems}"
+        except ValueError as e:
+            return f"Error: Invalid budget input - {str(e)}"
+        except Exception as e:
+            return f"Error: Unable to compute budget - {str(e)}"
+
+        return result.to_markdown()
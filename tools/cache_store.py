@@ -0,0 +1,100 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+
+class CacheStore():
+    """
+    Persistent key/value store backed by SQLite.
+    Entries expire after a caller-supplied maximum age and the store is kept
+    below `max_entries` by evicting the least recently used keys.
+    """
+
+    def __init__(self, path: str, table: str = 'cache', max_entries: int = 1000):
+        if not re.match(r'^[A-Za-z_][A-Za-z0-9_]*$', table):
+            raise ValueError(f"Invalid cache table name: {table}")
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {table} ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, '
+                'created_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+            )
+            self._conn.execute(f'CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed_at)')
+
+    def get_entry(self, key: str, max_age: Optional[float] = None) -> Optional[Tuple[bytes, float]]:
+        """Return (value, created_at) for a key, or None if it is missing or older than max_age seconds."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                f'SELECT value, created_at FROM {self.table} WHERE key = ?', (key,)
+            ).fetchone()
+            if row is not None and max_age is not None and now - row[1] > max_age:
+                self._conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(f'UPDATE {self.table} SET accessed_at = ? WHERE key = ?', (now, key))
+            self.hits += 1
+            return bytes(row[0]), row[1]
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[bytes]:
+        entry = self.get_entry(key, max_age)
+        return entry[0] if entry else None
+
+    def set(self, key: str, value: bytes) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                f'INSERT OR REPLACE INTO {self.table} (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, sqlite3.Binary(value), now, now)
+            )
+            count = self._conn.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    f'DELETE FROM {self.table} WHERE key IN '
+                    f'(SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)',
+                    (count - self.max_entries,)
+                )
+
+    def touch(self, key: str) -> None:
+        """Reset an entry's age, e.g. after the origin confirmed it is still current."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                f'UPDATE {self.table} SET created_at = ?, accessed_at = ? WHERE key = ?', (now, now, key)
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(f'DELETE FROM {self.table}')
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': entries,
+            'max_entries': self.max_entries,
+        }
@@ -1,92 +1,60 @@
 from langchain.tools import tool
+from metrics import traced
 from pydantic import BaseModel, Field
-import re
-import math
+from typing import List
+from tools.expression_engine import ExpressionError, evaluate, format_result
 
 class CalculatorInput(BaseModel):
     expression: str = Field(description="Mathematical expression or calculation to evaluate (e.g., '100 * 50', '2500 + 1000', 'sqrt(16)')")
 
+class BatchCalculatorInput(BaseModel):
+    expressions: List[str] = Field(description="List of mathematical expressions to evaluate in one call (e.g., ['250 * 100', '15000 + 25000', '18% of 50000'])")
+
 class CalculatorTools():
     @tool("calculate", args_schema=CalculatorInput, return_direct=False)
     @staticmethod
+    @traced('tool')
     def calculate(expression: str) -> str:
         """Calculate mathematical expressions safely. Supports basic arithmetic, percentages, and common mathematical functions."""
-        
-        # Debug logging
-        print(f"DEBUG: CalculatorTools received expression type: {type(expression)}")
-        print(f"DEBUG: CalculatorTools received expression value: {repr(expression)}")
-        
+
         # Handle empty or invalid input
         if not expression or not isinstance(expression, str) or not expression.strip():
             return "Error: Please provide a valid mathematical expression as a string."
-        
+
+        result = CalculatorTools.evaluate_expression(expression)
+        if result.startswith("Error:"):
+            return result
+        return f"Result: {result}"
+
+    @tool("calculate_batch", args_schema=BatchCalculatorInput, return_direct=False)
+    @staticmethod
+    @traced('tool')
+    def calculate_batch(expressions: List[str]) -> str:
+        """Calculate several mathematical expressions in one call and return every result. Use this for all the line items of a budget at once."""
+
+        if isinstance(expressions, str):
+            expressions = [expressions]
+        if not expressions or not isinstance(expressions, list):
+            return "Error: Please provide a list of mathematical expressions."
+
+        lines = []
+        for i, expression in enumerate(expressions, start=1):
+            if not isinstance(expression, str) or not expression.strip():
+                lines.append(f"{i}. Error: Empty or invalid expression.")
+                continue
+            lines.append(f"{i}. {expression.strip()} = {CalculatorTools.evaluate_expression(expression)}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def evaluate_expression(expression: str) -> str:
+        """Evaluate one expression and return the formatted result or an error message."""
         try:
-            # Clean the expression
-            expression = expression.strip()
-            
-            # Replace common mathematical functions and constants
-            expression = expression.replace('sqrt', 'math.sqrt')
-            expression = expression.replace('pow', 'math.pow')
-            expression = expression.replace('pi', 'math.pi')
-            expression = expression.replace('e', 'math.e')
-            expression = expression.replace('sin', 'math.sin')
-            expression = expression.replace('cos', 'math.cos')
-            expression = expression.replace('tan', 'math.tan')
-            expression = expression.replace('log', 'math.log')
-            expression = expression.replace('abs', 'abs')
-            
-            # Handle percentage calculations
-            if '%' in expression:
-                # Simple percentage handling (e.g., "20% of 100" or "100 + 20%")
-                if ' of ' in expression:
-                    parts = expression.split(' of ')
-                    if len(parts) == 2:
-                        percent = float(parts[0].replace('%', '')) / 100
-                        value = float(parts[1])
-                        result = percent * value
-                        return f"Result: {result}"
-                elif '+' in expression and '%' in expression:
-                    # Handle cases like "100 + 20%"
-                    parts = expression.split('+')
-                    if len(parts) == 2 and '%' in parts[1]:
-                        base = float(parts[0].strip())
-                        percent = float(parts[1].strip().replace('%', '')) / 100
-                        result = base + (base * percent)
-                        return f"Result: {result}"
-            
-            # Create a safe evaluation environment
-            safe_dict = {
-                "__builtins__": {},
-                "math": math,
-                "abs": abs,
-                "round": round,
-                "min": min,
-                "max": max,
-                "sum": sum,
-                "pow": pow
-            }
-            
-            # Validate expression contains only safe characters
-            if not re.match(r'^[0-9+\-*/.() \t\n,mathsqrtpowlogsincotan]+$', expression.replace('math.', '')):
-                return "Error: Expression contains invalid characters. Only numbers, basic operators (+, -, *, /, **), parentheses, and math functions are allowed."
-            
-            # Evaluate the expression
-            result = eval(expression, safe_dict)
-            
-            # Format the result
-            if isinstance(result, float):
-                if result.is_integer():
-                    result = int(result)
-                else:
-                    result = round(result, 2)
-            
-            return f"Result: {result}"
-            
+            return format_result(evaluate(expression))
         except ZeroDivisionError:
             return "Error: Division by zero is not allowed."
-        except ValueError as e:
+        except ExpressionError as e:
+            return f"Error: Invalid mathematical expression - {str(e)} Only numbers, basic operators (+, -, *, /, **, %), parentheses, and math functions are allowed."
+        except (ValueError, OverflowError) as e:
             return f"Error: Invalid mathematical expression - {str(e)}"
-        except SyntaxError:
-            return "Error: Invalid syntax in mathematical expression."
         except Exception as e:
-            return f"Error: Unable to calculate expression - {str(e)}"
\ No newline at end of file
+            return f"Error: Unable to calculate expression - {str(e)}"
@@ -0,0 +1,35 @@
+import re
+
+# Former, colloquial and English names mapped to the canonical city name
+CITY_ALIASES = {
+    'bangalore': 'bengaluru',
+    'bengalooru': 'bengaluru',
+    'bombay': 'mumbai',
+    'navi mumbai': 'mumbai',
+    'madras': 'chennai',
+    'calcutta': 'kolkata',
+    'new delhi': 'delhi',
+    'delhi ncr': 'delhi',
+    'ncr': 'delhi',
+    'gurgaon': 'gurugram',
+    'poona': 'pune',
+    'mysore': 'mysuru',
+    'mangalore': 'mangaluru',
+    'cochin': 'kochi',
+    'trivandrum': 'thiruvananthapuram',
+    'baroda': 'vadodara',
+    'vizag': 'visakhapatnam',
+    'pondicherry': 'puducherry',
+    'benares': 'varanasi',
+    'banaras': 'varanasi',
+    'cawnpore': 'kanpur',
+    'simla': 'shimla',
+}
+
+
+def normalize_city(location: str) -> str:
+    """Canonical city name, e.g. 'Bangalore, India' and ' bengaluru ' both become 'bengaluru'."""
+    city = re.sub(r'[^\w\s]', ' ', (location or '').casefold())
+    city = ' '.join(city.split())
+    city = re.sub(r'\s+india$', '', city)
+    return CITY_ALIASES.get(city, city)
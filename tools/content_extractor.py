@@ -0,0 +1,133 @@
+import re
+from typing import List, Optional
+
+from bs4 import BeautifulSoup
+from bs4.element import NavigableString, PreformattedString, Tag
+
+# lxml builds the tree several times faster than the pure-Python html.parser
+try:
+    import lxml  # noqa: F401
+    PARSER_BACKEND = 'lxml'
+except ImportError:
+    PARSER_BACKEND = 'html.parser'
+
+SKIP_TAGS = {'script', 'style', 'noscript', 'template', 'svg', 'iframe'}
+TEXT_TAGS = {'p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+CONTAINER_TAGS = {'main', 'article'}
+CONTAINER_CLASSES = {'content', 'main-content', 'post-content'}
+CONTAINER_IDS = {'content'}
+
+# Blocks made up mostly of link text are navigation, not content
+MAX_LINK_DENSITY = 0.5
+
+WHITESPACE = re.compile(r'\s+')
+
+
+class ContentBlock():
+    """Text collected from one content container or paragraph."""
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.link_chars = 0
+
+    @property
+    def text(self) -> str:
+        return WHITESPACE.sub(' ', ' '.join(self.parts)).strip()
+
+    @property
+    def score(self) -> float:
+        text_chars = sum(len(part.strip()) for part in self.parts)
+        if not text_chars:
+            return 0.0
+        link_density = self.link_chars / text_chars
+        if link_density > MAX_LINK_DENSITY:
+            return 0.0
+        return text_chars * (1 - link_density)
+
+
+class ExtractedPage():
+    def __init__(self, title: str, description: str, text: str):
+        self.title = title
+        self.description = description
+        self.text = text
+
+
+def is_container(tag: Tag) -> bool:
+    if tag.name in CONTAINER_TAGS:
+        return True
+    if tag.get('id') in CONTAINER_IDS:
+        return True
+    classes = tag.get('class') or []
+    return any(cls in CONTAINER_CLASSES for cls in classes)
+
+
+def extract(html, max_chars: Optional[int] = None) -> ExtractedPage:
+    """
+    Extract the title, meta description and main text of a page in a single tree walk.
+
+    Content containers (main, article, .content, #content, ...) are collected
+    once each; containers nested inside another container are folded into the
+    outer block instead of being collected twice. Paragraphs and headings are
+    gathered in the same walk and used only when no container has content.
+    """
+    soup = BeautifulSoup(html, PARSER_BACKEND)
+
+    title = None
+    description = ''
+    containers: List[ContentBlock] = []
+    paragraphs: List[ContentBlock] = []
+
+    # (node, enclosing container, enclosing paragraph, inside a link)
+    stack = [(soup, None, None, False)]
+    while stack:
+        node, container, paragraph, in_link = stack.pop()
+
+        if isinstance(node, NavigableString):
+            if isinstance(node, PreformattedString):
+                continue  # comments, doctypes, CDATA
+            if container is not None:
+                container.parts.append(node)
+                if in_link:
+                    container.link_chars += len(node.strip())
+            if paragraph is not None:
+                paragraph.parts.append(node)
+            continue
+
+        if not isinstance(node, Tag):
+            continue
+
+        name = node.name
+        if name == 'title' and title is None:
+            title = node.get_text()
+            continue
+        if name == 'meta' and not description and str(node.get('name', '')).lower() == 'description':
+            description = str(node.get('content', '')).strip()
+            continue
+        if name in SKIP_TAGS:
+            continue
+
+        if container is None and is_container(node):
+            container = ContentBlock()
+            containers.append(container)
+        if paragraph is None and name in TEXT_TAGS:
+            paragraph = ContentBlock()
+            paragraphs.append(paragraph)
+        if name == 'a':
+            in_link = True
+
+        stack.extend((child, container, paragraph, in_link) for child in reversed(node.contents))
+
+    blocks = [block for block in containers if block.score > 0]
+    if not blocks:
+        blocks = [block for block in paragraphs if block.score > 0]
+    texts = [block.text for block in blocks]
+    text = ' '.join(t for t in texts if t)
+
+    if max_chars is not None and len(text) > max_chars:
+        text = text[:max_chars] + "..."
+
+    return ExtractedPage(
+        title=title.strip() if title and title.strip() else "No title found",
+        description=description,
+        text=text
+    )
@@ -0,0 +1,194 @@
+import ast
+import math
+import operator
+import re
+from functools import lru_cache
+from typing import Union
+
+Number = Union[int, float]
+
+MAX_EXPONENT = 1000
+# Integer results are capped at about 1200 digits; a chain of powers could otherwise
+# run for minutes and exhaust memory
+MAX_RESULT_BITS = 4096
+MAX_EXPRESSION_LENGTH = 500
+
+
+class ExpressionError(ValueError):
+    """Raised for expressions that are malformed or use anything outside the whitelist."""
+
+
+def _checked_pow(base, exponent):
+    if abs(exponent) > MAX_EXPONENT:
+        raise ExpressionError(f"Exponent {exponent} is too large (limit {MAX_EXPONENT}).")
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0 \
+            and base.bit_length() * exponent > MAX_RESULT_BITS:
+        raise ExpressionError(f"A power with a {base.bit_length()}-bit base and exponent {exponent} is too large to calculate.")
+    return operator.pow(base, exponent)
+
+
+FUNCTIONS = {
+    'sqrt': math.sqrt,
+    'pow': _checked_pow,
+    'log': math.log,
+    'log10': math.log10,
+    'exp': math.exp,
+    'sin': math.sin,
+    'cos': math.cos,
+    'tan': math.tan,
+    'ceil': math.ceil,
+    'floor': math.floor,
+    'abs': abs,
+    'round': round,
+    'min': min,
+    'max': max,
+    'sum': sum,
+}
+
+CONSTANTS = {
+    'pi': math.pi,
+    'e': math.e,
+    'tau': math.tau,
+}
+
+BINARY_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+UNARY_OPERATORS = (ast.UAdd, ast.USub)
+
+# "100 + 20%" / "100 - 20%": add or subtract a percentage of the base value
+_PERCENT_CHANGE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([+-])\s*(\d+(?:\.\d+)?)\s*%\s*$')
+# "20% of 100"
+_PERCENT_OF = re.compile(r'(\d+(?:\.\d+)?)\s*%\s*of\b', re.IGNORECASE)
+# A trailing percent sign not followed by an operand, e.g. "250 * 18%"; "10 % 3" stays modulo
+_PERCENT = re.compile(r'(\d+(?:\.\d+)?)\s*%(?=\s*(?:$|[)+\-*/,]))')
+# Amounts with digit-grouping commas, Western ("1,500,000") or Indian ("15,00,000")
+_GROUPED_NUMBER = re.compile(r'(?<![\w.,])(?:\d{1,3}(?:,\d{3})+|\d{1,2}(?:,\d{2})+,\d{3})(?:\.\d+)?(?![\w,])')
+_CALL_OPEN = re.compile(r'\w\s*\($')
+
+
+def _inside_call(expression: str, index: int) -> bool:
+    """Whether index falls inside the argument list of a function call, e.g. the 2 in max(1,2)."""
+    calls = []
+    for position, char in enumerate(expression[:index]):
+        if char == '(':
+            calls.append(bool(_CALL_OPEN.search(expression[:position + 1])))
+        elif char == ')' and calls:
+            calls.pop()
+    return any(calls)
+
+
+def _strip_grouping(expression: str) -> str:
+    # Inside a call the commas may separate arguments, so max(1,250) is left alone
+    return _GROUPED_NUMBER.sub(
+        lambda match: match.group(0) if _inside_call(expression, match.start()) else match.group(0).replace(',', ''),
+        expression
+    )
+
+
+def normalize(expression: str) -> str:
+    """Rewrite percentage shorthand into plain arithmetic, drop digit-grouping commas and tidy whitespace."""
+    expression = ' '.join(expression.strip().split())
+    expression = expression.replace('^', '**').replace('×', '*').replace('÷', '/')
+    expression = _strip_grouping(expression)
+
+    match = _PERCENT_CHANGE.match(expression)
+    if match:
+        base, sign, percent = match.groups()
+        return f"{base} * (1 {sign} {percent} / 100)"
+    expression = _PERCENT_OF.sub(r'(\1 / 100) *', expression)
+    return _PERCENT.sub(r'(\1 / 100)', expression)
+
+
+class _Validator(ast.NodeTransformer):
+    """Rejects any node outside the arithmetic whitelist and routes ** through the exponent guard."""
+
+    def generic_visit(self, node):
+        if not isinstance(node, (ast.Expression, ast.Load) + BINARY_OPERATORS + UNARY_OPERATORS):
+            raise ExpressionError(f"Unsupported syntax: {type(node).__name__}")
+        return super().generic_visit(node)
+
+    def visit_Tuple(self, node):
+        # Only reached outside call arguments, e.g. "25,000 * 12" parsed as (25, 0 * 12)
+        raise ExpressionError("Commas are only allowed between function arguments; write amounts without separators.")
+
+    visit_List = visit_Tuple
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ExpressionError(f"Unsupported value: {node.value!r}")
+        return node
+
+    def visit_Name(self, node):
+        if node.id not in CONSTANTS and node.id not in FUNCTIONS:
+            raise ExpressionError(f"Unknown name: {node.id}")
+        return node
+
+    def visit_BinOp(self, node):
+        if not isinstance(node.op, BINARY_OPERATORS):
+            raise ExpressionError(f"Unsupported operator: {type(node.op).__name__}")
+        node = super().generic_visit(node)
+        if isinstance(node.op, ast.Pow):
+            return ast.copy_location(
+                ast.Call(func=ast.Name(id='pow', ctx=ast.Load()), args=[node.left, node.right], keywords=[]),
+                node
+            )
+        return node
+
+    def visit_UnaryOp(self, node):
+        if not isinstance(node.op, UNARY_OPERATORS):
+            raise ExpressionError(f"Unsupported operator: {type(node.op).__name__}")
+        return super().generic_visit(node)
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            raise ExpressionError("Only whitelisted math functions can be called.")
+        if node.keywords:
+            raise ExpressionError("Keyword arguments are not supported.")
+        node.args = [self._visit_argument(arg) for arg in node.args]
+        return node
+
+    def _visit_argument(self, node):
+        # sum([1, 2, 3]) and max((1, 2)) take a sequence of numbers
+        if isinstance(node, (ast.Tuple, ast.List)):
+            node.elts = [self.visit(element) for element in node.elts]
+            return node
+        return self.visit(node)
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(expression: str):
+    """Parse, validate and compile a normalized expression; compiled code objects are cached."""
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise ExpressionError(f"Expression is longer than {MAX_EXPRESSION_LENGTH} characters.")
+    try:
+        tree = ast.parse(expression, mode='eval')
+    except SyntaxError:
+        raise ExpressionError("Invalid syntax in mathematical expression.")
+    tree = ast.fix_missing_locations(_Validator().visit(tree))
+    return compile(tree, '<expression>', 'eval')
+
+
+_NAMESPACE = {'__builtins__': {}, **FUNCTIONS, **CONSTANTS}
+
+
+@lru_cache(maxsize=4096)
+def _evaluate_normalized(expression: str) -> Number:
+    return eval(compile_expression(expression), _NAMESPACE)
+
+
+def evaluate(expression: str) -> Number:
+    """Evaluate an arithmetic expression. Results are memoized, as expressions have no free variables."""
+    if not expression or not expression.strip():
+        raise ExpressionError("Please provide a valid mathematical expression.")
+    result = _evaluate_normalized(normalize(expression))
+    if isinstance(result, int) and result.bit_length() > MAX_RESULT_BITS:
+        raise ExpressionError("The result is too large to display.")
+    return result
+
+
+def format_result(result: Number) -> str:
+    if isinstance(result, float):
+        if result.is_integer():
+            result = int(result)
+        else:
+            result = round(result, 2)
+    return str(result)
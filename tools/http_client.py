@@ -0,0 +1,59 @@
+import threading
+from typing import Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import Config
+from metrics import annotate, span
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+class InstrumentedSession(requests.Session):
+    """Session that records every request as an 'http' span with status and, unless streamed, response size."""
+
+    def request(self, method, url, *args, **kwargs):
+        host = urlparse(url).netloc
+        with span('http', host, method=method):
+            response = super().request(method, url, *args, **kwargs)
+            if kwargs.get('stream'):
+                # The body is not read yet; whoever reads it records the bytes (see read_limited)
+                annotate(status=response.status_code, streamed=True)
+            else:
+                annotate(status=response.status_code, bytes=len(response.content))
+            return response
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide HTTP session shared by all tools.
+    The session keeps per-host connection pools alive so repeated searches and
+    scrapes reuse TCP/TLS connections instead of opening a new one per call.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                config = Config.get_http_config()
+                session = InstrumentedSession()
+                adapter = HTTPAdapter(
+                    pool_connections=config['pool_connections'],
+                    pool_maxsize=config['pool_maxsize'],
+                    pool_block=config['pool_block']
+                )
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+def close_session() -> None:
+    """Close all pooled connections, e.g. on shutdown or after changing the pool configuration."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,312 @@
+"""
+Governor for outbound HTTP calls.
+
+Search API calls share a token bucket per API key, so concurrent plans stay
+under the provider's rate limit together instead of each hitting 429s. Calls
+that fail transiently (timeouts, dropped connections, 429 and 5xx) are retried
+with jittered exponential backoff, and slow search calls are hedged with a
+second request. Website scrapes go through a circuit breaker per domain, so a
+site that keeps failing is skipped for a while instead of costing every agent
+another timeout.
+"""
+import contextvars
+import hashlib
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from config import Config
+from metrics import annotate
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# Domains tracked by the circuit breakers; least recently used ones are forgotten first
+MAX_TRACKED_DOMAINS = 512
+HEDGE_WORKERS = 8
+
+_buckets: Dict[str, 'TokenBucket'] = {}
+_buckets_lock = threading.Lock()
+_breakers: 'OrderedDict[str, CircuitBreaker]' = OrderedDict()
+_breakers_lock = threading.Lock()
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+_hedge_lock = threading.Lock()
+
+
+class RateLimitExceeded(requests.RequestException):
+    """No request slot became free within the acquire timeout."""
+
+
+class CircuitOpenError(requests.RequestException):
+    """The domain failed repeatedly and is skipped until its breaker resets."""
+
+    def __init__(self, domain: str, retry_in: float):
+        super().__init__(f"{domain} failed repeatedly and is skipped for the next {retry_in:.0f}s")
+        self.domain = domain
+        self.retry_in = retry_in
+
+
+class TokenBucket():
+    """Allows `rate` calls per second on average with bursts of up to `capacity` calls."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        # Set by pause(); no tokens are handed out before this time
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Take one token, waiting for it if needed; False if none is free within timeout seconds."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                delay = max(self.blocked_until - now, (1 - self.tokens) / self.rate if self.tokens < 1 else 0.0)
+            if deadline is not None:
+                if now >= deadline:
+                    return False
+                delay = min(delay, deadline - now)
+            time.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller of this bucket for the next `seconds`, e.g. after the provider answered 429."""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class CircuitBreaker():
+    """
+    Consecutive-failure breaker: after `failures` failed calls it opens and
+    rejects calls for `reset_after` seconds, then lets one trial call through.
+    """
+
+    def __init__(self, failures: int, reset_after: float):
+        self.failures = failures
+        self.reset_after = reset_after
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_running = False
+        self._lock = threading.Lock()
+
+    def retry_in(self) -> float:
+        """Seconds until calls are let through again; 0 when the breaker is closed."""
+        with self._lock:
+            if self.opened_at is None:
+                return 0.0
+            return max(0.0, self.opened_at + self.reset_after - time.monotonic())
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_after or self.trial_running:
+                return False
+            # Half-open: a single trial call decides whether the domain is back
+            self.trial_running = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.trial_running or self.consecutive_failures >= self.failures:
+                self.opened_at = time.monotonic()
+            self.trial_running = False
+
+
+def get_rate_limiter(api_key: str) -> TokenBucket:
+    """Token bucket shared by every call made with this API key in the process."""
+    key = hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            config = Config.get_outbound_config()
+            bucket = _buckets[key] = TokenBucket(config['search_rate'], config['search_burst'])
+    return bucket
+
+
+def get_breaker(url: str) -> CircuitBreaker:
+    """Circuit breaker of the URL's domain."""
+    domain = urlparse(url).netloc.lower().removeprefix('www.')
+    with _breakers_lock:
+        breaker = _breakers.get(domain)
+        if breaker is None:
+            config = Config.get_outbound_config()
+            breaker = _breakers[domain] = CircuitBreaker(config['breaker_failures'], config['breaker_reset'])
+            while len(_breakers) > MAX_TRACKED_DOMAINS:
+                _breakers.popitem(last=False)
+        else:
+            _breakers.move_to_end(domain)
+    return breaker
+
+
+def is_transient(error: Exception) -> bool:
+    """Whether a failed call is worth repeating: timeouts, dropped connections, 429, 5xx and a busy rate limit."""
+    if isinstance(error, RateLimitExceeded):
+        return True
+    if isinstance(error, CircuitOpenError):
+        return False
+    if isinstance(error, requests.HTTPError):
+        return error.response is not None and error.response.status_code in RETRYABLE_STATUSES
+    return isinstance(error, (requests.Timeout, requests.ConnectionError))
+
+
+def raise_for_retryable(response: requests.Response) -> requests.Response:
+    """Turn 429 and 5xx responses into HTTPError so they are retried; other responses pass through."""
+    if response.status_code in RETRYABLE_STATUSES:
+        response.close()
+        raise requests.HTTPError(f"{response.status_code} {response.reason} for url: {response.url}", response=response)
+    return response
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Delay asked for by the server's Retry-After header, in seconds."""
+    response = getattr(error, 'response', None)
+    value = response.headers.get('Retry-After') if response is not None else None
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+
+def with_retries(call: Callable[[], requests.Response], attempts: int,
+                 retryable: Callable[[Exception], bool] = is_transient,
+                 on_retry: Optional[Callable[[Exception, float], None]] = None) -> requests.Response:
+    """Run call, retrying retryable failures with full-jitter exponential backoff."""
+    config = Config.get_outbound_config()
+    for attempt in range(attempts):
+        try:
+            response = call()
+            if attempt:
+                annotate(retries=attempt)
+            return response
+        except Exception as e:
+            if attempt == attempts - 1 or not retryable(e):
+                annotate(retries=attempt)
+                raise
+            delay = random.uniform(0, min(config['retry_max_delay'], config['retry_base_delay'] * 2 ** attempt))
+            delay = max(delay, min(retry_after(e) or 0.0, config['retry_max_delay']))
+            logger.info("Outbound call failed (%s), retrying in %.1fs", e, delay)
+            if on_retry:
+                on_retry(e, delay)
+            time.sleep(delay)
+
+
+def _get_hedge_executor() -> ThreadPoolExecutor:
+    global _hedge_executor
+    with _hedge_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix='hedge')
+    return _hedge_executor
+
+
+def _close_response(future: Future) -> None:
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def hedged(call: Callable[[], requests.Response], hedge_after: float,
+           can_hedge: Optional[Callable[[], bool]] = None) -> requests.Response:
+    """
+    Run call and, if it has not answered within hedge_after seconds of being sent, start a
+    second identical call (when can_hedge allows it); the first successful response wins.
+    hedge_after <= 0 disables hedging.
+    """
+    if hedge_after <= 0:
+        return call()
+
+    # The primary request gets a thread of its own, so it is sent right away rather than
+    # queueing behind other searches; only hedges share the bounded hedge pool
+    primary = Future()
+    primary.set_running_or_notify_cancel()
+
+    def send_primary():
+        try:
+            primary.set_result(call())
+        except BaseException as e:
+            primary.set_exception(e)
+
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(send_primary,), name='search', daemon=True).start()
+    done, _ = wait([primary], timeout=hedge_after)
+    if done or (can_hedge is not None and not can_hedge()):
+        return primary.result()
+
+    annotate(hedged=True)
+    hedge = _get_hedge_executor().submit(contextvars.copy_context().run, call)
+    pending = {primary, hedge}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                for other in pending:
+                    # A hedge still queued is dropped; a losing response is closed once it arrives
+                    if not other.cancel():
+                        other.add_done_callback(_close_response)
+                return future.result()
+            error = future.exception()
+    raise error
+
+
+def search_request(api_key: str, send: Callable[[], requests.Response]) -> requests.Response:
+    """Send a search API request under the key's rate limit, with retries and hedging."""
+    config = Config.get_outbound_config()
+    bucket = get_rate_limiter(api_key)
+
+    def attempt():
+        if not bucket.acquire(config['acquire_timeout']):
+            raise RateLimitExceeded(f"No search request slot became free within {config['acquire_timeout']:g}s")
+        # A hedge is only sent if the rate limit has a slot free right now
+        return hedged(lambda: raise_for_retryable(send()), config['hedge_after'], lambda: bucket.acquire(timeout=0))
+
+    def on_retry(error, delay):
+        # The provider is throttling this key: slow down every concurrent caller, not just this one
+        if isinstance(error, requests.HTTPError) and error.response.status_code == 429:
+            bucket.pause(delay)
+
+    return with_retries(attempt, config['search_attempts'], on_retry=on_retry)
+
+
+def scrape_request(url: str, send: Callable[[], requests.Response]) -> requests.Response:
+    """Send a website request through the domain's circuit breaker, with retries."""
+    breaker = get_breaker(url)
+    if not breaker.allow():
+        annotate(circuit_open=True)
+        raise CircuitOpenError(urlparse(url).netloc, breaker.retry_in())
+    try:
+        # A timed out page is not fetched again: a second full timeout costs more than it is likely to gain
+        response = with_retries(lambda: raise_for_retryable(send()), Config.get_outbound_config()['scrape_attempts'],
+                                retryable=lambda e: is_transient(e) and not isinstance(e, requests.Timeout))
+    except Exception as e:
+        if is_transient(e):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        raise
+    breaker.record_success()
+    return response
@@ -0,0 +1,100 @@
+import json
+import threading
+import time
+import zlib
+from typing import Optional
+from urllib.parse import urlparse
+
+from config import Config
+from tools.cache_store import CacheStore
+
+_cache: Optional[CacheStore] = None
+_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> Optional[CacheStore]:
+    """Return the process-wide scraped page cache, or None when caching is disabled."""
+    global _cache
+    config = Config.get_page_cache_config()
+    if not config['enabled']:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = CacheStore(config['path'], table='pages', max_entries=config['max_entries'])
+    return _cache
+
+
+def freshness_for(url: str) -> int:
+    """
+    Number of seconds a stored summary for this URL is served without contacting the site.
+    Per-domain rules also apply to subdomains, e.g. a rule for example.com covers www.example.com.
+    """
+    config = Config.get_page_cache_config()
+    host = (urlparse(url).hostname or '').lower()
+    best_match = None
+    for domain, ttl in config['domain_ttls'].items():
+        if host == domain or host.endswith('.' + domain):
+            if best_match is None or len(domain) > len(best_match[0]):
+                best_match = (domain, ttl)
+    return best_match[1] if best_match else config['default_ttl']
+
+
+class CachedPage():
+    """A stored page summary together with the validators needed to revalidate it."""
+
+    def __init__(self, url: str, summary: str, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None, stored_at: float = 0.0):
+        self.url = url
+        self.summary = summary
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    @property
+    def is_fresh(self) -> bool:
+        return self.age < freshness_for(self.url)
+
+    def conditional_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+def load_page(url: str) -> Optional[CachedPage]:
+    cache = get_page_cache()
+    if cache is None:
+        return None
+    entry = cache.get_entry(url, max_age=Config.get_page_cache_config()['max_age'])
+    if entry is None:
+        return None
+    value, stored_at = entry
+    record = json.loads(zlib.decompress(value).decode('utf-8'))
+    return CachedPage(url, record['summary'], record.get('etag'), record.get('last_modified'), stored_at)
+
+
+def store_page(url: str, summary: str, headers) -> None:
+    """Store a freshly extracted summary along with the response's ETag/Last-Modified validators."""
+    cache = get_page_cache()
+    if cache is None:
+        return
+    record = {
+        'summary': summary,
+        'etag': headers.get('ETag'),
+        'last_modified': headers.get('Last-Modified'),
+    }
+    cache.set(url, zlib.compress(json.dumps(record).encode('utf-8')))
+
+
+def revalidated(page: CachedPage) -> str:
+    """Mark a stored page as confirmed current (HTTP 304) and return its summary."""
+    cache = get_page_cache()
+    if cache is not None:
+        cache.touch(page.url)
+    return page.summary
@@ -0,0 +1,41 @@
+import json
+import threading
+from typing import Optional
+
+from config import Config
+from tools.cache_store import CacheStore
+
+_cache: Optional[CacheStore] = None
+_cache_lock = threading.Lock()
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold and collapse whitespace so trivially different queries share a cache entry."""
+    return ' '.join(query.casefold().split())
+
+
+def get_search_cache() -> Optional[CacheStore]:
+    """Return the process-wide search cache, or None when caching is disabled."""
+    global _cache
+    config = Config.get_search_cache_config()
+    if not config['enabled']:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = CacheStore(config['path'], table='search_results', max_entries=config['max_entries'])
+    return _cache
+
+
+def get_cached_results(query: str) -> Optional[list]:
+    """Return the cached organic results for a query if a fresh entry exists."""
+    cache = get_search_cache()
+    if cache is None:
+        return None
+    value = cache.get(normalize_query(query), max_age=Config.get_search_cache_config()['ttl_seconds'])
+    return json.loads(value) if value is not None else None
+
+
+def store_results(query: str, results: list) -> None:
+    cache = get_search_cache()
+    if cache is not None:
+        cache.set(normalize_query(query), json.dumps(results).encode('utf-8'))
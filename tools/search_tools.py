@@ -1,23 +1,40 @@
 import json
 import os
 import requests
-import streamlit as st
 from langchain.tools import tool
+from metrics import annotate, span, traced
 from pydantic import BaseModel, Field
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from urllib.parse import urlparse
+from config import Config
+from prefetch import wait_for_prefetch
+from tools.http_client import get_session
+from tools.outbound import search_request
+from tools.search_cache import get_cached_results, normalize_query, store_results
+from tools.token_budget import budgeted
 
 class SearchInput(BaseModel):
     query: str = Field(description="Search query string to find information on the internet")
 
+class MultiSearchInput(BaseModel):
+    queries: List[str] = Field(description="List of related search query strings to run together")
+
+def normalize_link(link: str) -> str:
+    """Normalize a result link so the same page found by different queries is merged."""
+    parsed = urlparse(link.strip())
+    path = parsed.path.rstrip('/')
+    return f"{parsed.netloc.lower().removeprefix('www.')}{path}{'?' + parsed.query if parsed.query else ''}"
+
 class SearchTools():
     @tool("search_internet", args_schema=SearchInput, return_direct=False)
     @staticmethod
+    @traced('tool')
+    @budgeted
     def search_internet(query: str) -> str:
         """Useful to search the internet about a given topic and return relevant results. Input should be a search query string."""
         
-        # Debug logging
-        print(f"DEBUG: SearchTools received query type: {type(query)}")
-        print(f"DEBUG: SearchTools received query value: {repr(query)}")
-        
         # Handle empty or invalid input
         if not query or not isinstance(query, str) or not query.strip():
             return "Error: Please provide a valid search query as a string."
@@ -31,37 +48,15 @@ class SearchTools():
             return "Error: Unable to access API key configuration."
         
         top_result_to_return = 4
-        url = "https://google.serper.dev/search"
-        payload = json.dumps({"q": query.strip()})
-        headers = {
-            'X-API-KEY': api_key,
-            'content-type': 'application/json'
-        }
         
         try:
-            response = requests.post(url, headers=headers, data=payload, timeout=10)
-            response.raise_for_status()
-            
-            response_data = response.json()
+            results = SearchTools.fetch_results(query, api_key)
             
             # Check if there are organic results
-            if 'organic' not in response_data or not response_data['organic']:
+            if not results:
                 return "No search results found. Please try a different query."
             
-            results = response_data['organic']
-            formatted_results = []
-            
-            for result in results[:top_result_to_return]:
-                try:
-                    formatted_results.append('\n'.join([
-                        f"Title: {result.get('title', 'N/A')}", 
-                        f"Link: {result.get('link', 'N/A')}",
-                        f"Snippet: {result.get('snippet', 'N/A')}", 
-                        "\n-----------------"
-                    ]))
-                except Exception as e:
-                    continue
-
+            formatted_results = SearchTools.format_results(results[:top_result_to_return])
             if not formatted_results:
                 return "No valid search results could be formatted."
             
@@ -72,4 +67,116 @@ class SearchTools():
         except json.JSONDecodeError:
             return "Error: Invalid response from search service."
         except Exception as e:
-            return f"Error: Unexpected error during search - {str(e)}"
\ No newline at end of file
+            return f"Error: Unexpected error during search - {str(e)}"
+    
+    @tool("search_many", args_schema=MultiSearchInput, return_direct=False)
+    @staticmethod
+    @traced('tool')
+    @budgeted
+    def search_many(queries: List[str]) -> str:
+        """Run several related search queries at once and return one merged, de-duplicated and ranked result list. Prefer this over repeated single searches."""
+        
+        if isinstance(queries, str):
+            queries = [queries]
+        if not queries or not isinstance(queries, list):
+            return "Error: Please provide a list of search queries."
+        
+        # Drop blanks and duplicate queries while keeping the agent's order
+        unique_queries = []
+        seen = set()
+        for query in queries:
+            if isinstance(query, str) and query.strip() and normalize_query(query) not in seen:
+                seen.add(normalize_query(query))
+                unique_queries.append(query.strip())
+        if not unique_queries:
+            return "Error: Please provide at least one valid search query."
+        
+        api_key = os.getenv('SERPER_API_KEY')
+        if not api_key:
+            return "Error: SERPER_API_KEY not configured. Please add it to your Streamlit secrets or environment variables."
+        
+        serper_config = Config.get_serper_config()
+        unique_queries = unique_queries[:serper_config['many_max_queries']]
+        
+        errors = []
+        merged = {}
+        with ThreadPoolExecutor(max_workers=len(unique_queries)) as executor:
+            futures = {
+                executor.submit(contextvars.copy_context().run, SearchTools.fetch_query, query, api_key): query
+                for query in unique_queries
+            }
+            for future, query in futures.items():
+                try:
+                    results = future.result()
+                except Exception as e:
+                    errors.append(f"Error: Search for '{query}' failed - {str(e)}")
+                    continue
+                for position, result in enumerate(results):
+                    link = result.get('link')
+                    if not link:
+                        continue
+                    entry = merged.setdefault(normalize_link(link), {'result': result, 'score': 0.0, 'queries': []})
+                    # Reciprocal rank: pages ranked high by several queries come first
+                    entry['score'] += 1.0 / (position + 1)
+                    entry['queries'].append(query)
+        
+        if not merged:
+            return "\n".join(errors) if errors else "No search results found. Please try different queries."
+        
+        ranked = sorted(merged.values(), key=lambda entry: entry['score'], reverse=True)
+        ranked = ranked[:serper_config['many_max_results']]
+        formatted_results = SearchTools.format_results(
+            [entry['result'] for entry in ranked],
+            matched_queries=[entry['queries'] for entry in ranked]
+        )
+        return '\n'.join(formatted_results + errors)
+    
+    @staticmethod
+    def fetch_results(query: str, api_key: str, prefetch: bool = False) -> list:
+        """Return the organic results for a query, from the cache when possible. prefetch=True marks the prefetch's own call."""
+        # The same query may already be on its way from the prefetch started at submit time
+        if not prefetch and wait_for_prefetch(query):
+            annotate(prefetched=True)
+        # Repeated queries are served from the on-disk cache without a network round trip
+        results = get_cached_results(query)
+        annotate(cache_hit=results is not None)
+        if results is None:
+            payload = json.dumps({"q": query.strip()})
+            headers = {
+                'X-API-KEY': api_key,
+                'content-type': 'application/json'
+            }
+            
+            # Rate limited per API key, retried on 429/5xx and hedged when slow
+            response = search_request(api_key, lambda: get_session().post(Config.get_serper_config()['url'], headers=headers, data=payload, timeout=10))
+            response.raise_for_status()
+            
+            response_data = response.json()
+            results = response_data.get('organic') or []
+            if results:
+                store_results(query, results)
+        return results
+    
+    @staticmethod
+    def fetch_query(query: str, api_key: str) -> list:
+        """fetch_results in a span of its own, so concurrent queries do not overwrite each other's annotations."""
+        with span('search', query):
+            return SearchTools.fetch_results(query, api_key)
+    
+    @staticmethod
+    def format_results(results: list, matched_queries: Optional[List[List[str]]] = None) -> List[str]:
+        formatted_results = []
+        for i, result in enumerate(results):
+            try:
+                lines = [
+                    f"Title: {result.get('title', 'N/A')}", 
+                    f"Link: {result.get('link', 'N/A')}",
+                    f"Snippet: {result.get('snippet', 'N/A')}", 
+                ]
+                if matched_queries:
+                    lines.append(f"Matched queries: {'; '.join(matched_queries[i])}")
+                lines.append("\n-----------------")
+                formatted_results.append('\n'.join(lines))
+            except Exception as e:
+                continue
+        return formatted_results
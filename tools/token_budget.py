@@ -0,0 +1,208 @@
+"""
+Token budgets for tool output.
+
+Search results and scraped pages are compressed before they reach an agent:
+structural lines (titles, links, contacts) are kept verbatim, free text is
+reduced by extractive sentence ranking at sentence boundaries, and fields the
+agent has already seen in earlier tool calls of the same task are dropped
+whole. Each agent task has a total token budget, so later tool calls get
+progressively smaller outputs instead of growing the prompt without bound.
+"""
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from functools import wraps
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+from metrics import annotate, current_agent, current_run_id
+
+# Lines starting with these hold prose that may be shortened; everything else is kept as is
+COMPRESSIBLE_PREFIXES = ('Snippet:', 'Description:', 'Content Summary:')
+# Unprefixed lines longer than this are treated as prose too
+LONG_LINE_CHARS = 200
+
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9₹"(])')
+WORD = re.compile(r'\w+')
+# Sentences carrying numbers, prices or contact details are what agents quote most
+FACT_PATTERN = re.compile(r'\d|₹|\brs\.?\s|\binr\b|@|\bcapacity\b|\bguests\b|\bpax\b', re.IGNORECASE)
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has have in is it its of on or our that the their this to was we '
+    'were will with you your can all more also than into up out about'.split()
+)
+
+# Budgets kept per (run, agent); bounded so long-lived servers do not grow without limit
+MAX_TRACKED_BUDGETS = 256
+MIN_FIELD_TOKENS = 15
+# A sentence is kept whole even if it overruns its allowance, unless it is this many times too long
+MAX_SENTENCE_OVERRUN = 3
+# Weight of word overlap with already selected sentences when ranking
+REDUNDANCY_PENALTY = 1.0
+
+_budgets: 'OrderedDict[Tuple[Optional[str], str], ContextBudget]' = OrderedDict()
+_budgets_lock = threading.Lock()
+
+
+def estimate_tokens(chars: int) -> int:
+    """Rough token count for English text (about four characters per token)."""
+    return (chars + 3) // 4
+
+
+def split_sentences(text: str) -> List[str]:
+    return [sentence.strip() for sentence in SENTENCE_SPLIT.split(text) if sentence.strip()]
+
+
+def _words(text: str) -> List[str]:
+    return [word for word in WORD.findall(text.casefold()) if word not in STOPWORDS]
+
+
+def fingerprint(sentence: str) -> str:
+    return ' '.join(WORD.findall(sentence.casefold()))
+
+
+def truncate_words(text: str, max_tokens: int) -> str:
+    max_chars = max_tokens * 4
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(' ', 1)[0].rstrip(',;:') + '...'
+
+
+def rank_sentences(sentences: List[str], query: str = '') -> List[int]:
+    """
+    Indices of sentences ordered by importance: centrality (sharing frequent words
+    with the rest of the text), overlap with the query, concrete facts and position.
+    Sentences are picked greedily and penalised for repeating already picked ones,
+    so templated text ("seats up to N guests...") is not kept several times over.
+    """
+    word_sets = [set(_words(sentence)) for sentence in sentences]
+    document_words = Counter(word for words in word_sets for word in words)
+    query_words = set(_words(query))
+    scores = []
+    for i, (sentence, words) in enumerate(zip(sentences, word_sets)):
+        score = sum(document_words[word] - 1 for word in words) / math.sqrt(len(words) + 1)
+        score += 2.0 * len(words & query_words)
+        score += 1.5 if FACT_PATTERN.search(sentence) else 0.0
+        score += 1.0 if i == 0 else 0.0
+        scores.append(score)
+    top = max(scores) or 1.0
+
+    def redundancy(i: int, picked: List[int]) -> float:
+        overlaps = [len(word_sets[i] & word_sets[j]) / (len(word_sets[i] | word_sets[j]) or 1) for j in picked]
+        return max(overlaps, default=0.0)
+
+    order: List[int] = []
+    remaining = set(range(len(sentences)))
+    while remaining:
+        best = max(remaining, key=lambda i: scores[i] / top - REDUNDANCY_PENALTY * redundancy(i, order))
+        order.append(best)
+        remaining.remove(best)
+    return order
+
+
+def compress_text(text: str, max_tokens: int, query: str = '') -> str:
+    """
+    Keep whole sentences that fit in max_tokens, in their original order: the opening
+    sentence, which usually names what the rest describes, then the highest ranked ones.
+    """
+    if estimate_tokens(len(text)) <= max_tokens:
+        return text
+    sentences = split_sentences(text)
+    if estimate_tokens(len(sentences[0])) > max_tokens * MAX_SENTENCE_OVERRUN:
+        # Unpunctuated text (e.g. scraped navigation) has no boundary to cut at
+        return truncate_words(text, max_tokens)
+    kept, used = {0}, estimate_tokens(len(sentences[0]) + 1)
+    for i in rank_sentences(sentences, query):
+        cost = estimate_tokens(len(sentences[i]) + 1)
+        if i not in kept and used + cost <= max_tokens:
+            kept.add(i)
+            used += cost
+    return ' '.join(sentences[i] for i in sorted(kept))
+
+
+class ContextBudget():
+    """Token allowance and already-seen sentences of one agent task."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self.seen = set()
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.limit - self.used)
+
+    def fit(self, output: str, query: str = '') -> str:
+        """Deduplicate and compress one tool output to this task's remaining allowance."""
+        config = Config.get_token_budget_config()
+        with self._lock:
+            allowance = max(config['min_output_tokens'], min(config['tool_output_tokens'], self.remaining))
+            lines = output.split('\n')
+
+            # Drop whole fields seen earlier in this task or this output; titles and links always stay
+            prose: Dict[int, Tuple[str, str]] = {}
+            in_output = set()
+            for i, line in enumerate(lines):
+                prefix = next((p for p in COMPRESSIBLE_PREFIXES if line.startswith(p)), None)
+                if prefix is None and len(line) < LONG_LINE_CHARS:
+                    continue
+                prefix = prefix or ''
+                text = line[len(prefix):].strip()
+                key = fingerprint(text)
+                if len(key.split()) >= 4 and (key in self.seen or key in in_output):
+                    text = ''
+                in_output.add(key)
+                prose[i] = (prefix, text)
+
+            # Share what the structural lines leave over between prose fields by size
+            structural_tokens = sum(estimate_tokens(len(line) + 1) for i, line in enumerate(lines) if i not in prose)
+            prose_tokens = sum(estimate_tokens(len(text)) for _, text in prose.values())
+            available = max(allowance - structural_tokens, MIN_FIELD_TOKENS * len(prose))
+            for i, (prefix, text) in prose.items():
+                if not text:
+                    lines[i] = f"{prefix} (repeats earlier results)".strip()
+                    continue
+                share = available * estimate_tokens(len(text)) // prose_tokens if prose_tokens else available
+                compressed = compress_text(text, max(MIN_FIELD_TOKENS, share), query)
+                self.seen.add(fingerprint(text))
+                lines[i] = f"{prefix} {compressed}".strip() if prefix else compressed
+
+            result = '\n'.join(lines)
+            self.used += estimate_tokens(len(result))
+            return result
+
+
+def current_budget() -> ContextBudget:
+    """Budget of the agent task running in this context; a throwaway budget outside of agent tasks."""
+    config = Config.get_token_budget_config()
+    agent = current_agent.get()
+    limit = config['agent_limits'].get(agent, config['agent_limit']) if agent else config['agent_limit']
+    if agent is None:
+        return ContextBudget(limit)
+    key = (current_run_id.get(), agent)
+    with _budgets_lock:
+        budget = _budgets.get(key)
+        if budget is None:
+            budget = _budgets[key] = ContextBudget(limit)
+            while len(_budgets) > MAX_TRACKED_BUDGETS:
+                _budgets.popitem(last=False)
+        else:
+            _budgets.move_to_end(key)
+    return budget
+
+
+def budgeted(fn):
+    """Decorator fitting a tool's string output into the calling agent's token budget; errors pass through."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        result = fn(*args, **kwargs)
+        if not isinstance(result, str) or result.startswith('Error:') or not Config.get_token_budget_config()['enabled']:
+            return result
+        query = kwargs.get('query') or ' '.join(kwargs.get('queries') or [])
+        if not query and args and isinstance(args[0], str):
+            query = args[0]
+        compressed = current_budget().fit(result, query if isinstance(query, str) else '')
+        annotate(tokens_before=estimate_tokens(len(result)), tokens_after=estimate_tokens(len(compressed)))
+        return compressed
+    return wrapper
@@ -0,0 +1,257 @@
+"""
+Local catalog of venues seen in earlier scrapes.
+
+Venue pages are reduced to a record (city, capacity, amenities, price and
+contact details) and stored in SQLite with an FTS5 index over name, amenities
+and page text, so the Venue Finder can answer common cities without going to
+the web. SQLite builds without FTS5 fall back to LIKE matching.
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+from config import Config
+from tools.cities import CITY_ALIASES, normalize_city
+
+_catalog: Optional['VenueCatalog'] = None
+_catalog_lock = threading.Lock()
+
+# Canonical names of cities we recognise on venue pages, in addition to CITY_ALIASES
+KNOWN_CITIES = {
+    'mumbai', 'delhi', 'bengaluru', 'chennai', 'kolkata', 'hyderabad', 'pune', 'ahmedabad', 'jaipur',
+    'gurugram', 'noida', 'goa', 'kochi', 'chandigarh', 'lucknow', 'indore', 'bhopal', 'nagpur', 'surat',
+    'vadodara', 'coimbatore', 'mysuru', 'mangaluru', 'thiruvananthapuram', 'visakhapatnam', 'udaipur',
+    'jodhpur', 'agra', 'varanasi', 'puducherry', 'shimla', 'dehradun', 'rishikesh', 'amritsar', 'kanpur',
+    'bhubaneswar', 'guwahati', 'nashik', 'lonavala', 'ooty', 'munnar', 'manali',
+}
+CITY_PATTERN = re.compile(
+    r'\b(' + '|'.join(re.escape(name) for name in sorted(KNOWN_CITIES | set(CITY_ALIASES), key=len, reverse=True)) + r')\b',
+    re.IGNORECASE
+)
+
+CAPACITY_PATTERNS = [
+    re.compile(r'(?:up to|upto|accommodates?|seats?|hosts?|holds?)\s+(\d[\d,]*)\s*(?:guests|people|persons|pax|attendees|delegates|seated)?', re.IGNORECASE),
+    re.compile(r'capacity(?:\s+of)?[\s:]+(\d[\d,]*)', re.IGNORECASE),
+    re.compile(r'(\d[\d,]*)\s*(?:-\s*)?(?:seater|guests|pax|persons|attendees|delegates)\b', re.IGNORECASE),
+]
+PRICE_PATTERN = re.compile(
+    r'(?:₹|rs\.?|inr)\s*(\d[\d,]*(?:\.\d+)?)(\s*(?:lakh|lac|k)\b)?(\s*(?:per|/)\s*(?:plate|person|pax|head|day|hour|guest))?',
+    re.IGNORECASE
+)
+PHONE_PATTERN = re.compile(r'(?:\+91[-\s]?)?\(?0?\d{2,4}\)?[-\s]?\d{3,4}[-\s]?\d{4}')
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+
+AMENITIES = [
+    'parking', 'valet parking', 'wifi', 'projector', 'led screen', 'sound system', 'microphones', 'stage',
+    'lighting', 'in-house catering', 'catering', 'bar', 'air-conditioned', 'backup power', 'breakout rooms',
+    'green rooms', 'wheelchair access', 'accommodation', 'rooms', 'lawn', 'pool', 'terrace', 'garden',
+]
+AMENITY_PATTERN = re.compile(r'\b(' + '|'.join(re.escape(a) for a in sorted(AMENITIES, key=len, reverse=True)) + r')\b', re.IGNORECASE)
+
+# Pages need a city and a capacity or price to be worth cataloguing
+MIN_CAPACITY = 10
+
+# Aggregator and listicle pages describe many venues and are not catalogued as one
+LISTING_PATTERN = re.compile(r'\b(?:top|best)\s+\d+\b|\bvenues\s+(?:in|near|at)\b', re.IGNORECASE)
+# Title segments naming a section of a venue site rather than the venue itself
+GENERIC_TITLE_SEGMENTS = {
+    'home', 'contact', 'contact us', 'about', 'about us', 'events', 'meetings', 'meetings & events',
+    'meetings and events', 'corporate events', 'weddings', 'banquets', 'venues', 'gallery', 'offers',
+}
+
+
+class Venue():
+    def __init__(self, url: str, name: str, city: str, capacity: Optional[int] = None,
+                 amenities: Optional[List[str]] = None, price: Optional[str] = None,
+                 phone: Optional[str] = None, email: Optional[str] = None,
+                 summary: str = '', updated_at: float = 0.0):
+        self.url = url
+        self.name = name
+        self.city = city
+        self.capacity = capacity
+        self.amenities = amenities or []
+        self.price = price
+        self.phone = phone
+        self.email = email
+        self.summary = summary
+        self.updated_at = updated_at
+
+
+def _to_int(number: str) -> int:
+    return int(float(number.replace(',', '')))
+
+
+def detect_city(*texts: str) -> Optional[str]:
+    """Canonical name of the first known city mentioned, looking at the texts in order."""
+    for text in texts:
+        match = CITY_PATTERN.search(text or '')
+        if match:
+            return normalize_city(match.group(1))
+    return None
+
+
+def detect_capacity(text: str) -> Optional[int]:
+    """Largest plausible headcount mentioned on the page."""
+    counts = []
+    for pattern in CAPACITY_PATTERNS:
+        for match in pattern.finditer(text):
+            count = _to_int(match.group(1))
+            if MIN_CAPACITY <= count <= 100000:
+                counts.append(count)
+    return max(counts) if counts else None
+
+
+def detect_price(text: str) -> Optional[str]:
+    """First price mentioned, normalised to e.g. '₹75,000' or '₹1,500 per plate'."""
+    match = PRICE_PATTERN.search(text)
+    if not match:
+        return None
+    amount, multiplier, unit = match.group(1), (match.group(2) or '').strip(), (match.group(3) or '').strip()
+    price = f"₹{amount}" + (f" {multiplier}" if multiplier else '')
+    return price + (f" {unit.replace('/', 'per ').strip()}" if unit else '')
+
+
+def venue_name(title: str) -> str:
+    """Venue name from a page title, e.g. 'Meetings & Events | The Lakeside Grand, Mumbai' -> 'The Lakeside Grand'."""
+    for segment in re.split(r'\s+[-|–:]\s+', title or ''):
+        segment = segment.strip()
+        if not segment or segment.lower() in GENERIC_TITLE_SEGMENTS or CITY_PATTERN.fullmatch(segment):
+            continue
+        # Drop a trailing ", City"
+        return re.sub(r',\s*[^,]+$', lambda m: '' if CITY_PATTERN.search(m.group(0)) else m.group(0), segment).strip()
+    return ''
+
+
+def parse_venue(url: str, title: str, description: str, text: str) -> Optional[Venue]:
+    """Build a catalog record from a scraped page, or None if it does not look like a venue page."""
+    if LISTING_PATTERN.search(title or ''):
+        return None
+    city = detect_city(title, description, text)
+    capacity = detect_capacity(text)
+    price = detect_price(text)
+    if not city or (capacity is None and price is None):
+        return None
+    amenities = []
+    for match in AMENITY_PATTERN.finditer(text):
+        amenity = match.group(1).lower()
+        if amenity not in amenities:
+            amenities.append(amenity)
+    phone = PHONE_PATTERN.search(text)
+    email = EMAIL_PATTERN.search(text)
+    name = venue_name(title) or url
+    return Venue(
+        url, name, city, capacity, amenities, price,
+        phone.group(0).strip() if phone else None,
+        email.group(0) if email else None,
+        summary=(description + ' ' + text).strip()[:1000],
+        updated_at=time.time()
+    )
+
+
+class VenueCatalog():
+    """SQLite venue records with a full-text index over name, amenities and summary."""
+
+    COLUMNS = ('url', 'name', 'city', 'capacity', 'amenities', 'price', 'phone', 'email', 'summary', 'updated_at')
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS venues ('
+                'url TEXT PRIMARY KEY, name TEXT NOT NULL, city TEXT NOT NULL, capacity INTEGER, '
+                'amenities TEXT, price TEXT, phone TEXT, email TEXT, summary TEXT, updated_at REAL NOT NULL)'
+            )
+            self._conn.execute('CREATE INDEX IF NOT EXISTS venues_city_capacity ON venues (city, capacity)')
+            try:
+                self._conn.execute('CREATE VIRTUAL TABLE IF NOT EXISTS venues_fts USING fts5(url UNINDEXED, name, amenities, summary)')
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                self.has_fts = False
+
+    def upsert(self, venue: Venue) -> None:
+        values = (venue.url, venue.name, venue.city, venue.capacity, ', '.join(venue.amenities),
+                  venue.price, venue.phone, venue.email, venue.summary, venue.updated_at)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f'INSERT OR REPLACE INTO venues ({", ".join(self.COLUMNS)}) VALUES ({", ".join("?" * len(self.COLUMNS))})',
+                values
+            )
+            if self.has_fts:
+                self._conn.execute('DELETE FROM venues_fts WHERE url = ?', (venue.url,))
+                self._conn.execute(
+                    'INSERT INTO venues_fts (url, name, amenities, summary) VALUES (?, ?, ?, ?)',
+                    (venue.url, venue.name, ', '.join(venue.amenities), venue.summary)
+                )
+
+    def search(self, location: str, people_count: int, requirements: str = '', limit: int = 5,
+               max_age: Optional[float] = None) -> List[Venue]:
+        """
+        Venues in the location's city that fit the headcount, smallest suitable capacity first.
+        Requirement words (e.g. 'projector lawn') rank venues mentioning them higher.
+        """
+        city = normalize_city(location)
+        min_updated = time.time() - max_age if max_age else 0
+        terms = re.findall(r'\w+', requirements.lower())
+        columns = ', '.join(f'v.{column}' for column in self.COLUMNS)
+        where = 'v.city = ? AND (v.capacity IS NULL OR v.capacity >= ?) AND v.updated_at >= ?'
+        fit_order = 'v.capacity IS NULL, v.capacity, v.updated_at DESC'
+        params: list = [city, people_count, min_updated]
+
+        if terms and self.has_fts:
+            query = (f'SELECT {columns} FROM venues v LEFT JOIN '
+                     '(SELECT url, bm25(venues_fts) AS rank FROM venues_fts WHERE venues_fts MATCH ?) f ON f.url = v.url '
+                     f'WHERE {where} ORDER BY f.rank IS NULL, f.rank, {fit_order} LIMIT ?')
+            params = [' OR '.join(f'"{term}"' for term in terms)] + params
+        elif terms:
+            matches = ' + '.join('(v.summary LIKE ? OR v.amenities LIKE ?)' for _ in terms)
+            query = f'SELECT {columns} FROM venues v WHERE {where} ORDER BY ({matches}) DESC, {fit_order} LIMIT ?'
+            for term in terms:
+                params += [f'%{term}%', f'%{term}%']
+        else:
+            query = f'SELECT {columns} FROM venues v WHERE {where} ORDER BY {fit_order} LIMIT ?'
+
+        with self._lock:
+            rows = self._conn.execute(query, (*params, limit)).fetchall()
+        venues = []
+        for row in rows:
+            record = dict(zip(self.COLUMNS, row))
+            record['amenities'] = [a for a in (record['amenities'] or '').split(', ') if a]
+            venues.append(Venue(**record))
+        return venues
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM venues').fetchone()[0]
+
+
+def get_venue_catalog() -> Optional[VenueCatalog]:
+    """Return the process-wide venue catalog, or None when it is disabled."""
+    global _catalog
+    config = Config.get_venue_catalog_config()
+    if not config['enabled']:
+        return None
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = VenueCatalog(config['path'])
+    return _catalog
+
+
+def catalog_page(url: str, title: str, description: str, text: str) -> Optional[Venue]:
+    """Add a scraped page to the catalog if it describes a venue."""
+    catalog = get_venue_catalog()
+    if catalog is None:
+        return None
+    venue = parse_venue(url, title, description, text)
+    if venue is not None:
+        catalog.upsert(venue)
+    return venue
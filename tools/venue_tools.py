@@ -0,0 +1,53 @@
+import datetime
+from langchain.tools import tool
+from metrics import annotate, traced
+from pydantic import BaseModel, Field
+from config import Config
+from tools.cities import normalize_city
+from tools.venue_catalog import get_venue_catalog
+
+class VenueCatalogInput(BaseModel):
+    location: str = Field(description="City the event takes place in (e.g. 'Mumbai', 'Bangalore')")
+    people_count: int = Field(description="Number of attendees the venue must hold")
+    requirements: str = Field(default="", description="Optional space-separated must-haves to rank by (e.g. 'projector parking lawn')")
+
+class VenueTools():
+    @tool("search_venue_catalog", args_schema=VenueCatalogInput, return_direct=False)
+    @staticmethod
+    @traced('tool')
+    def search_venue_catalog(location: str, people_count: int, requirements: str = "") -> str:
+        """Look up venues in a city that fit the attendee count from the local catalog of previously researched venue websites. Check this before searching the web."""
+
+        if not location or not isinstance(location, str) or not location.strip():
+            return "Error: Please provide the event location as a string."
+        try:
+            people_count = int(people_count)
+        except (TypeError, ValueError):
+            return "Error: Please provide the number of attendees as a whole number."
+
+        catalog = get_venue_catalog()
+        if catalog is None:
+            return "The venue catalog is disabled. Use the search and browser tools to research venues."
+
+        config = Config.get_venue_catalog_config()
+        venues = catalog.search(location, people_count, requirements or "", limit=config['max_results'], max_age=config['max_age'])
+        annotate(cache_hit=bool(venues), results=len(venues))
+        if not venues:
+            return (f"No catalogued venues in {normalize_city(location).title()} for {people_count} attendees. "
+                    "Use the search and browser tools to research venues on the web.")
+
+        lines = [f"Found {len(venues)} catalogued venues in {venues[0].city.title()} for {people_count}+ attendees:"]
+        for i, venue in enumerate(venues, start=1):
+            details = [
+                f"Capacity: up to {venue.capacity}" if venue.capacity else "Capacity: not listed",
+                f"Price: {venue.price}" if venue.price else "Price: not listed",
+            ]
+            if venue.amenities:
+                details.append(f"Amenities: {', '.join(venue.amenities)}")
+            contact = ', '.join(filter(None, [venue.phone, venue.email]))
+            if contact:
+                details.append(f"Contact: {contact}")
+            checked = datetime.date.fromtimestamp(venue.updated_at).strftime('%Y-%m-%d')
+            details.append(f"Source: {venue.url} (checked {checked})")
+            lines.append(f"{i}. {venue.name}\n   " + "\n   ".join(details))
+        return "\n".join(lines)